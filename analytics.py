@@ -0,0 +1,197 @@
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+from typing import List
+
+# Marks flags of transcripts not sent because the run was stopped early, see
+# call_analysis.SKIPPED_VALUE. A transcript with any skipped flag was never fully
+# analyzed and is left out of every rate below.
+SKIPPED_VALUE = "skipped"
+
+# Values written into a flag cell when the provider call did not produce an answer.
+# "🔄" is the placeholder left behind when the response JSON was missing the flag.
+FAILURE_VALUES = ["failed", "error", SKIPPED_VALUE, "🔄", ""]
+
+# Upper bounds for the "Number of Messages" buckets
+MESSAGE_BUCKET_EDGES = [0, 5, 10, 20, 50, 100, np.inf]
+
+
+def normalize_flag_values(results_df: pd.DataFrame, flags: List[str]) -> pd.DataFrame:
+    """
+    Lower-case and strip the flag columns so "Yes", " yes" and "YES" compare equal
+
+    Args:
+        results_df (pd.DataFrame): Completed results with one column per flag
+        flags (List[str]): Flag column names
+
+    Returns:
+        pd.DataFrame: Normalized flag columns as categoricals
+    """
+    return pd.DataFrame(
+        {
+            flag: results_df[flag]
+            .fillna("")
+            .astype(str)
+            .str.strip()
+            .str.lower()
+            .astype("category")
+            for flag in flags
+        },
+        index=results_df.index,
+        columns=flags,
+    )
+
+
+def _sent_rows(values: pd.DataFrame) -> pd.Series:
+    """Rows whose transcript was sent, i.e. without any skipped flag"""
+    return ~values.eq(SKIPPED_VALUE).any(axis=1)
+
+
+def flag_violation_rates(results_df: pd.DataFrame, flags: List[str]) -> pd.DataFrame:
+    """
+    Share of answered calls where each flag came back "yes"
+
+    Args:
+        results_df (pd.DataFrame): Completed results with one column per flag
+        flags (List[str]): Flag column names
+
+    Returns:
+        pd.DataFrame: One row per flag with violation, answered and failure counts/rates
+    """
+    values = normalize_flag_values(results_df, flags)
+    values = values[_sent_rows(values)]
+    violations = values.eq("yes")
+    failures = values.isin(FAILURE_VALUES)
+    answered = ~failures
+
+    summary = pd.DataFrame(
+        {
+            "Violations": violations.sum(),
+            "Answered": answered.sum(),
+            "Failures": failures.sum(),
+        }
+    )
+    summary["Violation Rate"] = summary["Violations"] / summary["Answered"].replace(
+        0, np.nan
+    )
+    summary["Failure Rate"] = summary["Failures"] / len(values) if len(values) else np.nan
+    summary.index.name = "Flag"
+    return summary
+
+
+def flag_cooccurrence(
+    results_df: pd.DataFrame, flags: List[str], normalize: bool = False
+) -> pd.DataFrame:
+    """
+    Count how often two flags are violated on the same call
+
+    Args:
+        results_df (pd.DataFrame): Completed results with one column per flag
+        flags (List[str]): Flag column names
+        normalize (bool): If True, divide each row by its diagonal so a cell reads
+            "P(column flag = yes | row flag = yes)"
+
+    Returns:
+        pd.DataFrame: Square flag x flag matrix
+    """
+    values = normalize_flag_values(results_df, flags)
+    violations = values[_sent_rows(values)].eq("yes").to_numpy(np.int64)
+    counts = violations.T @ violations
+    matrix = pd.DataFrame(counts, index=flags, columns=flags)
+
+    if normalize:
+        diagonal = np.diag(counts).astype(float)
+        diagonal[diagonal == 0] = np.nan
+        matrix = matrix.div(diagonal, axis=0)
+
+    return matrix
+
+
+def message_buckets(number_of_messages: pd.Series) -> pd.Series:
+    """
+    Bucket the "Number of Messages" column into ordered categorical ranges
+
+    Args:
+        number_of_messages (pd.Series): Raw column, as read from the CSV (strings)
+
+    Returns:
+        pd.Series: Ordered categorical of bucket labels
+    """
+    counts = pd.to_numeric(number_of_messages, errors="coerce")
+    edges = MESSAGE_BUCKET_EDGES
+    labels = [
+        f"{int(low) + 1}+" if np.isinf(high) else f"{int(low) + 1}-{int(high)}"
+        for low, high in zip(edges[:-1], edges[1:])
+    ]
+    return pd.cut(counts, bins=edges, labels=labels, right=True)
+
+
+def violations_by_message_bucket(
+    results_df: pd.DataFrame, number_of_messages: pd.Series, flags: List[str]
+) -> pd.DataFrame:
+    """
+    Flag violation rates grouped by "Number of Messages" bucket
+
+    Like flag_violation_rates, a rate is violations over answered calls; cells
+    holding a FAILURE_VALUES entry are left out of the denominator.
+
+    Args:
+        results_df (pd.DataFrame): Completed results with one column per flag
+        number_of_messages (pd.Series): Column aligned with results_df rows
+        flags (List[str]): Flag column names
+
+    Returns:
+        pd.DataFrame: One row per bucket with a call count and per-flag violation rates
+    """
+    values = normalize_flag_values(results_df, flags)
+    # NaN for failed cells and skipped rows so the mean only counts answered calls
+    sent = _sent_rows(values)
+    answered = ~values.isin(FAILURE_VALUES) & sent.to_numpy()[:, None]
+    violations = values.eq("yes").astype(float).where(answered)
+    buckets = message_buckets(number_of_messages.reset_index(drop=True))
+    violations = violations.reset_index(drop=True)
+    sent = sent.reset_index(drop=True)
+
+    by_bucket = violations.groupby(buckets, observed=False).mean()
+    by_bucket.insert(0, "Calls", sent.groupby(buckets, observed=False).sum())
+    by_bucket.index.name = "Number of Messages"
+    return by_bucket
+
+
+def failure_rates_by_provider(
+    results_df: pd.DataFrame, flags: List[str], provider_column: str = "Model"
+) -> pd.DataFrame:
+    """
+    Share of calls per provider where every flag failed (API error or unparseable JSON)
+
+    Transcripts skipped after a run was stopped were never sent and are not counted.
+
+    Args:
+        results_df (pd.DataFrame): Completed results from one or more runs
+        flags (List[str]): Flag column names
+        provider_column (str): Column holding the provider that produced each row
+
+    Returns:
+        pd.DataFrame: One row per provider with call count, failed calls and rates
+    """
+    values = normalize_flag_values(results_df, flags)
+    sent = _sent_rows(values)
+    failures = values[sent].isin(FAILURE_VALUES)
+    providers = results_df.loc[sent, provider_column].astype("category")
+
+    frame = pd.DataFrame(
+        {
+            "Failed Calls": failures.all(axis=1),
+            "Failed Flags": failures.mean(axis=1),
+        }
+    )
+    grouped = frame.groupby(providers, observed=True)
+    summary = pd.DataFrame(
+        {
+            "Calls": grouped.size(),
+            "Failed Calls": grouped["Failed Calls"].sum(),
+            "Call Failure Rate": grouped["Failed Calls"].mean(),
+            "Flag Failure Rate": grouped["Failed Flags"].mean(),
+        }
+    )
+    summary.index.name = "Provider"
+    return summary
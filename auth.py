@@ -1,17 +1,17 @@
-import os
 import streamlit as st
-from dotenv import load_dotenv
+from settings import get_settings
 
 
 def check_password():
     """Returns `True` if the user had the correct password."""
-    load_dotenv()  # Load environment variables from .env file
+    settings = get_settings()
 
     def password_entered():
         """Checks whether a password entered by the user is correct."""
-        if st.session_state["username"].strip() == os.getenv(
-            "USERNAME", "admin"
-        ) and st.session_state["password"] == os.getenv("PASSWORD", "admin123"):
+        if (
+            st.session_state["username"].strip() == settings.username
+            and st.session_state["password"] == settings.password
+        ):
             st.session_state["password_correct"] = True
             del st.session_state["password"]  # Don't store the password.
             del st.session_state["username"]  # Don't store the username.
@@ -0,0 +1,277 @@
+"""
+Local OpenAI-compatible chat completions server for load testing.
+
+Answers every POST with a chat completion whose content is a JSON object
+covering the flags listed in the system prompt. Latency, errors, 429s and
+malformed responses are injected according to the command line options.
+Requests with "stream": true are answered with server-sent events, one
+chunk of a few characters per --token-latency.
+
+Usage:
+    python benchmarks/mock_llm_server.py --port 8765 --latency-median 2 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Dict, List, Tuple
+
+# Characters per streamed chunk, roughly one token
+CHUNK_SIZE = 4
+
+TRAILING_TEXT = (
+    "\n\nExplanation: I reviewed every message in the transcript and compared "
+    "the dates, names, currency amounts and PIN codes against the requested "
+    "formats before deciding on each flag above."
+)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency-median",
+        type=float,
+        default=1.0,
+        help="Median latency before the first token in seconds",
+    )
+    parser.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=0.5,
+        help="Sigma of the log-normal latency distribution (0 = constant latency)",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of requests answered with 500"
+    )
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests answered with 429 at random",
+    )
+    parser.add_argument(
+        "--rate-limit-rps",
+        type=float,
+        default=0.0,
+        help="Answer 429 once more than this many requests arrive per second (0 = off)",
+    )
+    parser.add_argument(
+        "--malformed-rate",
+        type=float,
+        default=0.0,
+        help="Share of 200 responses whose content is not valid JSON",
+    )
+    parser.add_argument(
+        "--token-latency",
+        type=float,
+        default=0.0,
+        help="Seconds to generate each chunk of CHUNK_SIZE characters",
+    )
+    parser.add_argument(
+        "--trailing-text-rate",
+        type=float,
+        default=0.0,
+        help="Share of answers followed by an explanation after the JSON object",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def extract_flags(system_prompt: str) -> List[str]:
+    """
+    Read the flag names back out of a prompt built by generate_system_prompt
+    """
+    return re.findall(r'^\s+"([^"]+)": <answer as per description>', system_prompt, re.M)
+
+
+class MockLLMServer:
+    """Minimal HTTP/1.1 server implementing POST chat completions"""
+
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        self.random = random.Random(options.seed)
+        self.window_start = time.monotonic()
+        self.window_count = 0
+
+    def sample_latency(self) -> float:
+        median = self.options.latency_median
+        if self.options.latency_sigma <= 0:
+            return median
+        return self.random.lognormvariate(0.0, self.options.latency_sigma) * median
+
+    def over_rate_limit(self) -> bool:
+        if self.options.rate_limit_rps <= 0:
+            return False
+        now = time.monotonic()
+        if now - self.window_start >= 1.0:
+            self.window_start = now
+            self.window_count = 0
+        self.window_count += 1
+        return self.window_count > self.options.rate_limit_rps
+
+    def completion_content(self, flags: List[str]) -> str:
+        answer = {flag: self.random.choice(["yes", "no"]) for flag in flags}
+        if self.random.random() < self.options.malformed_rate:
+            # Either prose around the JSON or a truncated object
+            if self.random.random() < 0.5:
+                return "Sure! Here is my analysis of the transcript: " + json.dumps(answer)[:-1]
+            return "I could not determine the answers for this transcript."
+        if self.random.random() < self.options.trailing_text_rate:
+            return json.dumps(answer) + TRAILING_TEXT
+        return json.dumps(answer)
+
+    def generation_time(self, content: str) -> float:
+        return -(-len(content) // CHUNK_SIZE) * self.options.token_latency
+
+    async def prepare(self, request: Dict) -> Tuple[int, Dict, str]:
+        """
+        Wait until the first token and decide the outcome of a request
+
+        Returns:
+            Tuple[int, Dict, str]: Status, error payload (non-200) and completion content
+        """
+        if self.over_rate_limit() or self.random.random() < self.options.rate_limit_rate:
+            return 429, {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}}, ""
+
+        await asyncio.sleep(self.sample_latency())
+
+        if self.random.random() < self.options.error_rate:
+            return 500, {"error": {"message": "Internal server error", "type": "server"}}, ""
+
+        messages = request.get("messages", [])
+        system_prompt = next(
+            (m.get("content", "") for m in messages if m.get("role") == "system"), ""
+        )
+        return 200, {}, self.completion_content(extract_flags(system_prompt))
+
+    async def respond(self, request: Dict) -> Tuple[int, Dict]:
+        status, error, content = await self.prepare(request)
+        if status != 200:
+            return status, error
+
+        await asyncio.sleep(self.generation_time(content))
+        return 200, {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    async def stream(self, request: Dict, writer: asyncio.StreamWriter) -> bool:
+        """
+        Answer a streaming request with server-sent events
+
+        Returns:
+            bool: True if the response was written as SSE (the connection must close)
+        """
+        status, error, content = await self.prepare(request)
+        if status != 200:
+            self.write_json(writer, status, error)
+            await writer.drain()
+            return False
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n"
+            b"\r\n"
+        )
+        try:
+            for start in range(0, len(content), CHUNK_SIZE):
+                await asyncio.sleep(self.options.token_latency)
+                event = {
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion.chunk",
+                    "choices": [
+                        {"index": 0, "delta": {"content": content[start : start + CHUNK_SIZE]}}
+                    ],
+                }
+                writer.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                await writer.drain()
+            writer.write(b"data: [DONE]\n\n")
+            await writer.drain()
+        except ConnectionError:
+            # The client closed the stream early
+            pass
+        return True
+
+    def write_json(self, writer: asyncio.StreamWriter, status: int, payload: Dict):
+        data = json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 429: "Too Many Requests"}.get(
+            status, "Internal Server Error"
+        )
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "\r\n".encode("latin-1")
+            + data
+        )
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                try:
+                    request = json.loads(body or b"{}")
+                except json.JSONDecodeError:
+                    self.write_json(writer, 400, {"error": {"message": "Invalid JSON body"}})
+                    await writer.drain()
+                    continue
+
+                if request.get("stream"):
+                    if await self.stream(request, writer):
+                        break
+                    continue
+
+                status, payload = await self.respond(request)
+                self.write_json(writer, status, payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        server = await asyncio.start_server(
+            self.handle, self.options.host, self.options.port, backlog=4096
+        )
+        print(
+            f"Mock LLM server listening on http://{self.options.host}:{self.options.port}",
+            flush=True,
+        )
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(MockLLMServer(parse_args()).serve())
+    except KeyboardInterrupt:
+        pass
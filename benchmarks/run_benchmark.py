@@ -0,0 +1,289 @@
+"""
+End-to-end load test of the analysis pipeline against the local mock server.
+
+Starts benchmarks/mock_llm_server.py, points the provider URLs at it and runs
+synthetic CSVs of several sizes and transcript lengths through the same
+load -> analyze_transcript_batch path the Analysis page uses.
+
+Usage:
+    python benchmarks/run_benchmark.py --rows 200 1000 --messages 10 60
+    python benchmarks/run_benchmark.py --error-rate 0.02 --malformed-rate 0.05 \\
+        --json bench.json --min-rows-per-sec 50 --max-p95 3
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+# Flags sent with every synthetic request
+BENCHMARK_CONFIG = {
+    "Loop": "Return yes if the assistant repeats the same message 3 or more times",
+    "Date": "Return yes if a date is not in DD/Mon/YYYY format",
+    "Name": "Return yes if a name is not in Title Case",
+    "Currency": "Return yes if a currency amount is not in Indian comma format",
+    "PIN": "Return yes if a PIN code contains commas",
+}
+
+SAMPLE_MESSAGES = [
+    "assistant: Namaste, am I speaking with Rahul Sharma?",
+    "user: Haan, boliye.",
+    "assistant: Your EMI of Rs 12,500 is due on 15/Jan/2024.",
+    "user: I will pay by Friday.",
+    "assistant: Please confirm your PIN code 560001.",
+    "user: It is 560 001.",
+    "assistant: Thank you, have a nice day.",
+]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analysis pipeline load test")
+    parser.add_argument("--rows", type=int, nargs="+", default=[200, 1000])
+    parser.add_argument(
+        "--messages",
+        type=int,
+        nargs="+",
+        default=[10, 60],
+        help="Messages per synthetic transcript",
+    )
+    parser.add_argument("--model", default="llama", choices=["llama", "gpt4o", "sarvam-m"])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=0, help="Mock server port (0 = free port)")
+    parser.add_argument("--latency-median", type=float, default=0.2)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rps", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--trailing-text-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--stream", action="store_true", help="Stream responses and stop at complete JSON"
+    )
+    parser.add_argument(
+        "--max-hedges",
+        type=int,
+        default=0,
+        help="Hedge requests slower than the observed p95, up to this many (0 = off)",
+    )
+    parser.add_argument(
+        "--group-output-tokens",
+        type=int,
+        default=0,
+        help="Split flags into automatic groups of this answer size (0 = single prompt)",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Write the report to this file as JSON")
+    parser.add_argument(
+        "--min-rows-per-sec", type=float, default=None, help="Fail if any scenario is slower"
+    )
+    parser.add_argument(
+        "--max-p95", type=float, default=None, help="Fail if any scenario's p95 (s) is higher"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show provider error output")
+    return parser.parse_args(argv)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_server(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    """
+    Launch the mock server in a subprocess and wait until it accepts connections
+    """
+    command = [
+        sys.executable,
+        os.path.join(ROOT, "benchmarks", "mock_llm_server.py"),
+        "--port", str(port),
+        "--latency-median", str(args.latency_median),
+        "--latency-sigma", str(args.latency_sigma),
+        "--error-rate", str(args.error_rate),
+        "--rate-limit-rate", str(args.rate_limit_rate),
+        "--rate-limit-rps", str(args.rate_limit_rps),
+        "--malformed-rate", str(args.malformed_rate),
+        "--token-latency", str(args.token_latency),
+        "--trailing-text-rate", str(args.trailing_text_rate),
+        "--seed", str(args.seed),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError):
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process
+        time.sleep(0.05)
+
+    process.kill()
+    raise RuntimeError("Mock LLM server did not start")
+
+
+def point_providers_at(url: str):
+    """
+    Route every provider to the mock server; must run before call_analysis is imported
+    """
+    for name in ("LLAMA_URL", "OPENAI_API_URL", "SARVAM_API_URL"):
+        os.environ[name] = url
+
+
+def synthetic_csv(rows: int, messages: int, seed: int) -> str:
+    """
+    Write a CSV with the columns the Home page requires and return its path
+    """
+    rng = random.Random(seed)
+    transcripts = [
+        "\n".join(rng.choice(SAMPLE_MESSAGES) for _ in range(messages)) + f"\n#{row}"
+        for row in range(rows)
+    ]
+    df = pd.DataFrame(
+        {
+            "Interaction ID": [f"bench-{row}" for row in range(rows)],
+            "Number of Messages": str(messages),
+            "Transcript": transcripts,
+        }
+    )
+    handle = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+    with handle:
+        df.to_csv(handle, index=False)
+    return handle.name
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(args: argparse.Namespace, rows: int, messages: int) -> Dict:
+    from call_analysis import analyze_transcript_batch, Hedger, LatencyTracker
+    from flag_groups import auto_flag_groups
+    from pilot import OUTCOMES, classify_result
+
+    path = synthetic_csv(rows, messages, args.seed)
+    try:
+        df = pd.read_csv(path, low_memory=False, dtype=str)
+    finally:
+        os.unlink(path)
+
+    latencies: List[float] = []
+    stream_timings: List[Dict] = []
+    outcomes: Dict[str, int] = {outcome: 0 for outcome in OUTCOMES}
+    hedger = Hedger(LatencyTracker(), args.max_hedges) if args.max_hedges else None
+    flag_groups = (
+        auto_flag_groups(BENCHMARK_CONFIG, args.group_output_tokens)
+        if args.group_output_tokens
+        else None
+    )
+
+    def on_result(idx: int, result: Dict[str, str]):
+        outcomes[classify_result(result, BENCHMARK_CONFIG)] += 1
+
+    async def run():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        return await analyze_transcript_batch(
+            df["Transcript"].tolist(),
+            BENCHMARK_CONFIG,
+            args.model,
+            semaphore,
+            on_result,
+            latencies,
+            hedger,
+            flag_groups,
+            args.stream,
+            stream_timings,
+        )
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    started = time.perf_counter()
+    with output:
+        asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = (
+        np.percentile(latencies, [50, 95, 99]) if latencies else (np.nan,) * 3
+    )
+    streaming = {}
+    if args.stream:
+        timings = pd.DataFrame(
+            stream_timings,
+            columns=["time_to_first_token", "time_to_json", "stopped_early"],
+        )
+        streaming = {
+            "ttft_p50": float(timings["time_to_first_token"].median()),
+            "json_p50": float(timings["time_to_json"].median()),
+            "stopped_early": int(timings["stopped_early"].sum()),
+        }
+    return {
+        "rows": rows,
+        "messages": messages,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed,
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "peak_rss_mb": peak_rss_mb(),
+        **outcomes,
+        "hedges": hedger.hedges_fired if hedger else 0,
+        **streaming,
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    port = args.port or free_port()
+    server = start_mock_server(args, port)
+    point_providers_at(f"http://127.0.0.1:{port}/v1/chat/completions")
+
+    try:
+        report = [
+            run_scenario(args, rows, messages)
+            for rows in args.rows
+            for messages in args.messages
+        ]
+    finally:
+        server.terminate()
+        server.wait()
+
+    table = pd.DataFrame(report).set_index(["rows", "messages"])
+    with pd.option_context(
+        "display.float_format", "{:,.3f}".format, "display.max_columns", None, "display.width", 200
+    ):
+        print(table)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    for scenario in report:
+        name = f"{scenario['rows']} rows x {scenario['messages']} messages"
+        if args.min_rows_per_sec is not None and scenario["rows_per_sec"] < args.min_rows_per_sec:
+            print(f"REGRESSION {name}: {scenario['rows_per_sec']:.1f} rows/sec")
+            failed = True
+        if args.max_p95 is not None and scenario["p95"] > args.max_p95:
+            print(f"REGRESSION {name}: p95 {scenario['p95']:.3f}s")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Cold-start and rerun timing for the Streamlit pages.
+
+Measures, in fresh interpreters, how long each application module takes to
+import, then uses Streamlit's AppTest to time the first run and subsequent
+reruns of every page with a logged-in session and a small uploaded CSV.
+
+Usage:
+    python benchmarks/startup_benchmark.py --reruns 20 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["auth", "settings", "call_analysis", "estimator", "dedup", "analytics"]
+
+PAGES = [
+    "main.py",
+    "pages/1_Home.py",
+    "pages/2_Config.py",
+    "pages/3_Analysis.py",
+    "pages/4_Analytics.py",
+]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Streamlit startup/rerun benchmark")
+    parser.add_argument("--reruns", type=int, default=10, help="Reruns timed per page")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows in the uploaded CSV")
+    parser.add_argument("--json", help="Write the report to this file as JSON")
+    return parser.parse_args(argv)
+
+
+def import_time(module: str) -> float:
+    """
+    Seconds to import a module in a fresh interpreter
+    """
+    code = (
+        "import sys, time; sys.path.insert(0, %r); started = time.perf_counter(); "
+        "import %s; print(time.perf_counter() - started)" % (ROOT, module)
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def logged_in_session(rows: int) -> Dict:
+    import pandas as pd  # type: ignore
+
+    # temp.json holds a sample flag config
+    with open(os.path.join(ROOT, "temp.json")) as f:
+        config = json.load(f)
+
+    df = pd.DataFrame(
+        {
+            "Interaction ID": [f"id-{row}" for row in range(rows)],
+            "Number of Messages": [str(row % 40 + 1) for row in range(rows)],
+            "Transcript": [f"assistant: hello {row % 97}\nuser: hi" for row in range(rows)],
+        }
+    )
+    results = df[["Interaction ID"]].assign(**{flag: "no" for flag in config})
+    return {
+        "password_correct": True,
+        "selected_model": "llama",
+        "uploaded_df": df,
+        "config_data": config,
+        "analysis_runs": {"llama": results},
+    }
+
+
+def time_page(page: str, session: Dict, reruns: int) -> Dict[str, float]:
+    """
+    Time the first run and the following reruns of a page script
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, page), default_timeout=60)
+    for key, value in session.items():
+        app.session_state[key] = value
+
+    started = time.perf_counter()
+    app.run()
+    first_run = time.perf_counter() - started
+
+    durations: List[float] = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        durations.append(time.perf_counter() - started)
+
+    return {
+        "page": page,
+        "first_run": first_run,
+        "rerun_median": statistics.median(durations) if durations else float("nan"),
+        "rerun_max": max(durations) if durations else float("nan"),
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    imports = {module: import_time(module) for module in MODULES}
+    print("Cold import (s)")
+    for module, seconds in imports.items():
+        print(f"  {module:<15} {seconds:.3f}")
+
+    session = logged_in_session(args.rows)
+    pages = [time_page(page, session, args.reruns) for page in PAGES]
+    print("\nPage runs (s)")
+    print(f"  {'page':<22} {'first':>8} {'median':>8} {'max':>8}")
+    for page in pages:
+        print(
+            f"  {page['page']:<22} {page['first_run']:>8.3f} "
+            f"{page['rerun_median']:>8.3f} {page['rerun_max']:>8.3f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"imports": imports, "pages": pages}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,36 @@
 import asyncio
-import os
 import httpx  # type: ignore
 import json
 import re
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+import time
+from collections import deque
+from typing import Dict, Any, Deque, List, Optional
+from settings import get_settings
+from streaming import IncrementalJSONObjectParser, parse_sse_line
 
-load_dotenv()
+_settings = get_settings()
 
 # OpenAI API configuration
-OPENAI_URL = os.getenv("OPENAI_API_URL", "none")
-OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY", "none")
+OPENAI_URL = _settings.openai_url
+OPENAI_API_KEY = _settings.openai_api_key
 
 #Sarvam API configuration
-SARVAM_URL = os.getenv("SARVAM_API_URL", "none")
-SARVAM_API_KEY = os.getenv("SARVAM_SUBSCRIPTION_KEY", "none")
+SARVAM_URL = _settings.sarvam_url
+SARVAM_API_KEY = _settings.sarvam_api_key
 
 
 # LLAMA API configuration
-LLAMA_URL = os.getenv("LLAMA_URL", "none")
-LLAMA_API_KEY = os.getenv("LLAMA_API_KEY", "none")
+LLAMA_URL = _settings.llama_url
+LLAMA_API_KEY = _settings.llama_api_key
+
+# Provider limits and pricing, see settings.Settings
+PROVIDER_LIMITS = _settings.provider_limits
+
+# Latest point, as a share of the request deadline, at which a hedge is sent
+HEDGE_DEADLINE_SHARE = 0.5
+
+# Value given to flags of transcripts skipped after a run was stopped
+SKIPPED_VALUE = "skipped"
 
 
 def generate_system_prompt(config: Dict[str, str]) -> str:
@@ -71,7 +82,10 @@ def generate_system_prompt(config: Dict[str, str]) -> str:
 
 
 async def analyze_transcript_with_config_llama(
-    transcript: str, config: Dict[str, str]
+    transcript: str,
+    config: Dict[str, str],
+    stream: bool = False,
+    timings: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, str]:
     """
     Analyze a transcript against provided config flags using OpenAI API
@@ -79,6 +93,8 @@ async def analyze_transcript_with_config_llama(
     Args:
         transcript (str): The call transcript to analyze
         config (Dict[str, str]): Configuration dictionary with flag names as keys and descriptions as values
+        stream (bool): Consume the response as server-sent events and stop once the JSON is complete
+        timings (Optional[List[Dict[str, Any]]]): Streaming timings are appended here
 
     Returns:
         Dict[str, str]: Dictionary with flag names as keys and "yes"/"no" as values
@@ -107,10 +123,23 @@ async def analyze_transcript_with_config_llama(
         "stream": False,
     }
 
+    if stream:
+        return await stream_chat_completion(
+            LLAMA_URL,
+            headers,
+            data,
+            config,
+            PROVIDER_LIMITS["llama"]["request_timeout"],
+            timings,
+        )
+
     try:
         async with httpx.AsyncClient() as client:
             response = await client.post(
-                LLAMA_URL, headers=headers, json=data, timeout=30.0  # Add timeout
+                LLAMA_URL,
+                headers=headers,
+                json=data,
+                timeout=PROVIDER_LIMITS["llama"]["request_timeout"],
             )
 
             if response.status_code == 200:
@@ -135,7 +164,10 @@ async def analyze_transcript_with_config_llama(
 
 
 async def analyze_transcript_with_config_gpt4o(
-    transcript: str, config: Dict[str, str]
+    transcript: str,
+    config: Dict[str, str],
+    stream: bool = False,
+    timings: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, str]:
     """
     Analyze a transcript against provided config flags using OpenAI API
@@ -143,6 +175,8 @@ async def analyze_transcript_with_config_gpt4o(
     Args:
         transcript (str): The call transcript to analyze
         config (Dict[str, str]): Configuration dictionary with flag names as keys and descriptions as values
+        stream (bool): Consume the response as server-sent events and stop once the JSON is complete
+        timings (Optional[List[Dict[str, Any]]]): Streaming timings are appended here
 
     Returns:
         Dict[str, str]: Dictionary with flag names as keys and "yes"/"no" as values
@@ -167,9 +201,24 @@ async def analyze_transcript_with_config_gpt4o(
 
     data = {"model": "gpt-4o", "messages": messages, "temperature": 0}
 
+    if stream:
+        return await stream_chat_completion(
+            OPENAI_URL,
+            headers,
+            data,
+            config,
+            PROVIDER_LIMITS["gpt4o"]["request_timeout"],
+            timings,
+        )
+
     try:
         async with httpx.AsyncClient() as client:
-            response = await client.post(OPENAI_URL, headers=headers, json=data)
+            response = await client.post(
+                OPENAI_URL,
+                headers=headers,
+                json=data,
+                timeout=PROVIDER_LIMITS["gpt4o"]["request_timeout"],
+            )
             if response.status_code == 200:
                 result = response.json()
                 api_response = result["choices"][0]["message"]["content"]
@@ -191,7 +240,10 @@ async def analyze_transcript_with_config_gpt4o(
 
 
 async def analyze_transcript_with_config_sarvam(
-    transcript: str, config: Dict[str, str]
+    transcript: str,
+    config: Dict[str, str],
+    stream: bool = False,
+    timings: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, str]:
     """
     Analyze a transcript against provided config flags using OpenAI API
@@ -199,6 +251,8 @@ async def analyze_transcript_with_config_sarvam(
     Args:
         transcript (str): The call transcript to analyze
         config (Dict[str, str]): Configuration dictionary with flag names as keys and descriptions as values
+        stream (bool): Consume the response as server-sent events and stop once the JSON is complete
+        timings (Optional[List[Dict[str, Any]]]): Streaming timings are appended here
 
     Returns:
         Dict[str, str]: Dictionary with flag names as keys and "yes"/"no" as values
@@ -223,13 +277,27 @@ async def analyze_transcript_with_config_sarvam(
 
     data = {"model": "sarvam-m", "messages": messages}
 
+    if stream:
+        json_result = await stream_chat_completion(
+            SARVAM_URL,
+            headers,
+            data,
+            config,
+            PROVIDER_LIMITS["sarvam-m"]["request_timeout"],
+            timings,
+        )
+        # Same pause as the non-streaming path, skipped when the call itself failed
+        if json_result != {flag: "failed" for flag in config.keys()}:
+            await asyncio.sleep(30)
+        return json_result
+
     try:
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 SARVAM_URL,
                 headers=headers,
                 json=data,
-                timeout=30.0  # Add timeout
+                timeout=PROVIDER_LIMITS["sarvam-m"]["request_timeout"],
             )
             
             if response.status_code == 200:
@@ -254,6 +322,94 @@ async def analyze_transcript_with_config_sarvam(
         return {flag: "failed" for flag in config.keys()}
 
 
+async def stream_chat_completion(
+    url: str,
+    headers: Dict[str, str],
+    data: Dict[str, Any],
+    config: Dict[str, str],
+    timeout: float,
+    timings: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, str]:
+    """
+    Call a chat completions endpoint with streaming and stop reading early
+
+    The stream is closed as soon as the first top-level JSON object is complete
+    and contains every config key, so trailing commentary is neither waited for
+    nor generated further. If that never happens, the full text goes through
+    extract_json_from_response like a non-streaming response.
+
+    Args:
+        url (str): Chat completions endpoint
+        headers (Dict[str, str]): Request headers
+        data (Dict[str, Any]): Request body; "stream" is forced to True
+        config (Dict[str, str]): Configuration dictionary with flag names as keys
+        timeout (float): httpx timeout in seconds
+        timings (Optional[List[Dict[str, Any]]]): If given, a dict with
+            time_to_first_token, time_to_json (seconds, None if not reached),
+            total and stopped_early (closed before [DONE]) is appended for the
+            request
+
+    Returns:
+        Dict[str, str]: Parsed JSON result, or "failed" for all flags on API errors
+    """
+    parser = IncrementalJSONObjectParser()
+    chunks: List[str] = []
+    started = time.perf_counter()
+    time_to_first_token = None
+    time_to_json = None
+    stopped_early = False
+
+    def record_timings():
+        if timings is not None:
+            timings.append(
+                {
+                    "time_to_first_token": time_to_first_token,
+                    "time_to_json": time_to_json,
+                    "total": time.perf_counter() - started,
+                    "stopped_early": stopped_early,
+                }
+            )
+
+    try:
+        async with httpx.AsyncClient() as client:
+            async with client.stream(
+                "POST", url, headers=headers, json={**data, "stream": True}, timeout=timeout
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    print(f"Error in API call: {response.status_code}")
+                    print(f"Response text: {response.text}")
+                    # Return default "failed" for all flags in case of API error
+                    return {flag: "failed" for flag in config.keys()}
+
+                async for line in response.aiter_lines():
+                    delta = parse_sse_line(line)
+                    if delta is None:
+                        break
+                    if not delta:
+                        continue
+                    if time_to_first_token is None:
+                        time_to_first_token = time.perf_counter() - started
+                    chunks.append(delta)
+                    if parser.feed(delta) and parser.has_keys(config.keys()):
+                        time_to_json = time.perf_counter() - started
+                        # Whether more text was coming is unknown without waiting
+                        # for it, so this counts closes before [DONE]
+                        stopped_early = True
+                        # Leaving the block closes the connection and ends generation
+                        break
+
+    except Exception as e:
+        print(f"Exception in API call: {str(e)}")
+        # Return default "failed" for all flags in case of exception
+        return {flag: "failed" for flag in config.keys()}
+
+    record_timings()
+    if time_to_json is not None:
+        return parser.result()
+    return extract_json_from_response("".join(chunks))
+
+
 def extract_json_from_response(response: str) -> Dict[str, str]:
     """
     Extract JSON object from OpenAI response using regex
@@ -334,7 +490,11 @@ def validate_response(
 
 
 async def analyze_transcript_with_config(
-    transcript: str, config: Dict[str, str], model: str
+    transcript: str,
+    config: Dict[str, str],
+    model: str,
+    stream: bool = False,
+    timings: Optional[List[Dict[str, Any]]] = None,
 ) -> Optional[Dict[str, str]]:
     """
     Analyze transcript with the specified model.
@@ -343,17 +503,289 @@ async def analyze_transcript_with_config(
         transcript (str): The transcript to analyze.
         config (Dict[str, str]): The analysis configuration.
         model (str): The model to use for analysis.
+        stream (bool): Stream the response and stop once the JSON is complete.
+        timings (Optional[List[Dict[str, Any]]]): Streaming timings are appended here.
 
     Returns:
         Optional[Dict[str, str]]: Analysis result or None if model is unknown.
     """
     if model == "llama":
-        return await analyze_transcript_with_config_llama(transcript, config)
+        return await analyze_transcript_with_config_llama(
+            transcript, config, stream, timings
+        )
     elif model == "gpt4o":
-        return await analyze_transcript_with_config_gpt4o(transcript, config)
+        return await analyze_transcript_with_config_gpt4o(
+            transcript, config, stream, timings
+        )
     elif model == "sarvam-m":
-        return await analyze_transcript_with_config_sarvam(transcript, config)
+        return await analyze_transcript_with_config_sarvam(
+            transcript, config, stream, timings
+        )
     else:
         # Handle unknown model
         print(f"Unknown model: {model}")
         return None
+
+
+def is_valid_result(result: Optional[Dict[str, str]]) -> bool:
+    """
+    Check whether a provider call produced parsed answers rather than a failure
+
+    Args:
+        result (Optional[Dict[str, str]]): Result of a provider call
+
+    Returns:
+        bool: False for None, an empty dict (unparseable JSON) or all "failed"/"error"
+    """
+    if not result:
+        return False
+    return not all(value in ("failed", "error") for value in result.values())
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies per provider"""
+
+    def __init__(self, window: int = 500, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self.samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model: str, seconds: float):
+        if model not in self.samples:
+            self.samples[model] = deque(maxlen=self.window)
+        self.samples[model].append(seconds)
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """
+        Return the q-th percentile (0-100) of recent latencies, or None if there are
+        fewer than min_samples observations
+        """
+        samples = self.samples.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+class Hedger:
+    """
+    Sends a duplicate request when the first one is slower than the provider's p95.
+
+    The duplicate goes to fallback_model (or the same model), the first valid
+    JSON result wins and the other request is cancelled. At most max_hedges
+    duplicates are sent over the lifetime of the hedger. Duplicates take a slot
+    of the batch semaphore, so they count against the concurrent request limit.
+    """
+
+    def __init__(
+        self,
+        tracker: LatencyTracker,
+        max_hedges: int,
+        fallback_model: Optional[str] = None,
+    ):
+        self.tracker = tracker
+        self.max_hedges = max_hedges
+        self.fallback_model = fallback_model
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def hedge_delay(self, model: str) -> float:
+        """
+        Seconds to wait before hedging: observed p95, or twice the configured
+        expected latency until enough requests have been observed, capped at
+        HEDGE_DEADLINE_SHARE of the request deadline
+        """
+        limits = PROVIDER_LIMITS.get(model, {})
+        p95 = self.tracker.percentile(model, 95)
+        delay = p95 if p95 is not None else limits.get("expected_latency", 10.0) * 2
+        # Leave the duplicate time to answer before the request deadline
+        deadline = limits.get("request_deadline")
+        if deadline is not None:
+            delay = min(delay, deadline * HEDGE_DEADLINE_SHARE)
+        return delay
+
+    async def _hedge_call(
+        self,
+        transcript: str,
+        config: Dict[str, str],
+        model: str,
+        stream: bool,
+        timings: Optional[List[Dict[str, Any]]],
+        semaphore: Optional[asyncio.Semaphore],
+    ) -> Optional[Dict[str, str]]:
+        if semaphore is None:
+            return await analyze_transcript_with_config(
+                transcript, config, model, stream, timings
+            )
+        async with semaphore:
+            return await analyze_transcript_with_config(
+                transcript, config, model, stream, timings
+            )
+
+    async def run(
+        self,
+        transcript: str,
+        config: Dict[str, str],
+        model: str,
+        stream: bool = False,
+        timings: Optional[List[Dict[str, Any]]] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Optional[Dict[str, str]]:
+        """
+        Analyze a transcript, hedging the request if it is slow
+
+        Only the primary request's latency is recorded. A primary that is
+        cancelled (it lost to the hedge or hit the deadline) is recorded with
+        its elapsed time, so slow requests are not dropped from the p95.
+
+        Args:
+            transcript (str): The transcript to analyze.
+            config (Dict[str, str]): The analysis configuration.
+            model (str): The model to use for the first request.
+            stream (bool): Stream responses, see stream_chat_completion.
+            timings (Optional[List[Dict[str, Any]]]): Streaming timings are appended here.
+            semaphore (Optional[asyncio.Semaphore]): If given, the hedge waits for
+                a slot so it counts against the concurrent request limit.
+
+        Returns:
+            Optional[Dict[str, str]]: The first valid result, or the primary
+                request's result if no request produced a valid one.
+        """
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(
+            analyze_transcript_with_config(transcript, config, model, stream, timings)
+        )
+        tasks = [primary]
+
+        # Cancel whatever is still running on every exit, including when the
+        # caller's deadline cancels this coroutine while it waits
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay(model))
+            if done or self.hedges_fired >= self.max_hedges:
+                return await primary
+
+            self.hedges_fired += 1
+            hedge_model = self.fallback_model or model
+            hedge = asyncio.ensure_future(
+                self._hedge_call(
+                    transcript, config, hedge_model, stream, timings, semaphore
+                )
+            )
+            tasks.append(hedge)
+            pending = {primary, hedge}
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if is_valid_result(task.result()):
+                        if task is hedge:
+                            self.hedges_won += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            elapsed = time.perf_counter() - started
+            if not primary.done() or primary.cancelled():
+                # Still running or cut off: the request took at least this long
+                self.tracker.record(model, elapsed)
+            elif primary.exception() is None and is_valid_result(primary.result()):
+                self.tracker.record(model, elapsed)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+async def analyze_transcript_batch(
+    transcripts: List[str],
+    config: Dict[str, str],
+    model: str,
+    semaphore: asyncio.Semaphore,
+    progress_callback=None,
+    latencies: Optional[List[float]] = None,
+    hedger: Optional[Hedger] = None,
+    flag_groups: Optional[List[Dict[str, str]]] = None,
+    stream: bool = False,
+    stream_timings: Optional[List[Dict[str, Any]]] = None,
+    monitor=None,
+):
+    """
+    Process transcripts in batches with semaphore control.
+    The semaphore limits concurrent provider requests. If flag_groups is given,
+    each transcript is analyzed with one request per group, sent concurrently
+    and merged into one result; a failing group only affects its own flags.
+    If a latencies list is given, the duration of every request is appended to it.
+    Every request is cut off after the model's request_deadline; if a hedger is
+    given, slow requests are duplicated as described in Hedger. With stream=True
+    responses are read as server-sent events and closed once the JSON is
+    complete; per-request timings are appended to stream_timings.
+    If a monitor (pilot.FailureMonitor) is given, every result is recorded and
+    once it trips, requests that have not started are skipped instead of sent.
+    """
+    results = []
+    deadline = PROVIDER_LIMITS.get(model, {}).get("request_deadline")
+    groups = flag_groups or [config]
+
+    async def call_model(transcript: str, group_config: Dict[str, str]):
+        if hedger is not None:
+            return await hedger.run(
+                transcript, group_config, model, stream, stream_timings, semaphore
+            )
+        if model == "llama":
+            return await analyze_transcript_with_config_llama(
+                transcript, group_config, stream, stream_timings
+            )
+        elif model == "gpt4o":
+            return await analyze_transcript_with_config_gpt4o(
+                transcript, group_config, stream, stream_timings
+            )
+        else:
+            return await analyze_transcript_with_config_sarvam(
+                transcript, group_config, stream, stream_timings
+            )
+
+    async def process_group(idx: int, transcript: str, group_config: Dict[str, str]):
+        async with semaphore:
+            if monitor is not None and monitor.tripped:
+                return {flag: SKIPPED_VALUE for flag in group_config.keys()}
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(
+                    call_model(transcript, group_config), timeout=deadline
+                )
+            except asyncio.TimeoutError:
+                print(f"Transcript {idx} exceeded the {deadline}s deadline")
+                result = {flag: "failed" for flag in group_config.keys()}
+            except Exception as e:
+                print(f"Error processing transcript {idx}: {e}")
+                result = {flag: "error" for flag in group_config.keys()}
+            if latencies is not None:
+                latencies.append(time.perf_counter() - started)
+            return result
+
+    async def process_single_transcript(idx: int, transcript: str):
+        group_results = await asyncio.gather(
+            *(process_group(idx, transcript, group) for group in groups)
+        )
+        result: Dict[str, str] = {}
+        for group_result in group_results:
+            result.update(group_result or {})
+        # With flag groups a transcript can be part answered, part skipped; it was
+        # not fully analyzed either way, so it is not judged by the monitor
+        skipped = any(value == SKIPPED_VALUE for value in result.values())
+        if monitor is not None and not skipped:
+            monitor.record(result)
+        if progress_callback:
+            progress_callback(idx, result)
+        return idx, result
+
+    # Create tasks for all transcripts
+    tasks = [
+        process_single_transcript(idx, transcript)
+        for idx, transcript in enumerate(transcripts)
+    ]
+
+    # Process all tasks
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    return results
@@ -0,0 +1,194 @@
+import zlib
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+from typing import Dict, List
+
+# MinHash / LSH parameters: 16 bands of 4 rows detect pairs with Jaccard >~ 0.5
+# with high probability; candidates are then checked against the threshold.
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+SHINGLE_SIZE = 3
+# Shingle hashes are reduced mod this 31-bit prime so a * h + b fits in uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_transcripts(transcripts: pd.Series) -> pd.Series:
+    """
+    Collapse whitespace so formatting-only differences hash the same.
+
+    Case, digits and punctuation are kept on purpose: flags such as Name, Date,
+    Currency and PIN depend on exactly those details.
+
+    Args:
+        transcripts (pd.Series): Raw transcript column
+
+    Returns:
+        pd.Series: Normalized transcripts
+    """
+    # str.split() without arguments splits on runs of whitespace and drops the
+    # ends; several times faster than a regex replace on large columns
+    texts = transcripts.fillna("").astype(str)
+    return pd.Series(
+        [" ".join(text.split()) for text in texts], index=texts.index, dtype=object
+    )
+
+
+def exact_duplicate_representatives(transcripts: pd.Series) -> np.ndarray:
+    """
+    Map every row to the first row with the same normalized transcript
+
+    Args:
+        transcripts (pd.Series): Raw transcript column
+
+    Returns:
+        np.ndarray: For each row position, the position of its representative row
+    """
+    hashes = pd.util.hash_pandas_object(
+        normalize_transcripts(transcripts), index=False
+    ).to_numpy()
+    _, first_positions, inverse = np.unique(
+        hashes, return_index=True, return_inverse=True
+    )
+    return first_positions[inverse]
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """
+    Hash the word shingles of a normalized transcript into sorted, distinct uint64
+    values. Words are split on whitespace only, keeping case and punctuation.
+    """
+    words = text.split()
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [
+            " ".join(words[i : i + SHINGLE_SIZE])
+            for i in range(len(words) - SHINGLE_SIZE + 1)
+        ]
+    return np.unique(
+        np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+    )
+
+
+def _jaccard(left: np.ndarray, right: np.ndarray) -> float:
+    """Jaccard similarity of two sorted, distinct shingle hash arrays"""
+    intersection = len(np.intersect1d(left, right, assume_unique=True))
+    union = len(left) + len(right) - intersection
+    return intersection / union if union else 1.0
+
+
+def minhash_signatures(texts: List[str], seed: int = 42) -> np.ndarray:
+    """
+    Compute MinHash signatures over word shingles
+
+    Args:
+        texts (List[str]): Transcripts to sign
+        seed (int): Seed for the permutation coefficients
+
+    Returns:
+        np.ndarray: Array of shape (len(texts), NUM_PERMUTATIONS)
+    """
+    return _signatures_from_shingles([_shingle_hashes(text) for text in texts], seed)
+
+
+def _signatures_from_shingles(shingle_sets: List[np.ndarray], seed: int = 42) -> np.ndarray:
+    """MinHash signatures for precomputed shingle hash arrays"""
+    # Universal hash family (a * h + b) mod p with a, b uniform in [1, p) / [0, p).
+    # With h < p < 2^31 the product stays below 2^62, so nothing overflows uint64.
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+    signatures = np.empty((len(shingle_sets), NUM_PERMUTATIONS), dtype=np.uint64)
+    for row, hashes in enumerate(shingle_sets):
+        reduced = hashes % np.uint64(MERSENNE_PRIME)
+        # (a * h + b) mod p for every (shingle, permutation) pair, then min per permutation
+        permuted = (np.outer(reduced, a) + b) % np.uint64(MERSENNE_PRIME)
+        signatures[row] = permuted.min(axis=0)
+    return signatures
+
+
+def near_duplicate_representatives(
+    transcripts: pd.Series, threshold: float = 0.9
+) -> np.ndarray:
+    """
+    Group exact and near-duplicate transcripts using MinHash with LSH banding
+
+    Exact duplicates are collapsed first, so signatures are only computed once per
+    distinct transcript. Within an LSH bucket every member is compared to the
+    bucket's first member, which keeps the work linear in the number of rows.
+    Candidates are merged only if the exact Jaccard similarity of their shingle
+    sets reaches the threshold, so a MinHash collision never merges two rows. A
+    threshold of 1.0 only collapses exact duplicates.
+
+    Args:
+        transcripts (pd.Series): Raw transcript column
+        threshold (float): Minimum Jaccard similarity to merge two transcripts
+
+    Returns:
+        np.ndarray: For each row position, the position of its representative row
+    """
+    exact = exact_duplicate_representatives(transcripts)
+    if threshold >= 1.0 or len(exact) == 0:
+        return exact
+    unique_positions = np.unique(exact)
+    texts = normalize_transcripts(transcripts).to_numpy()[unique_positions].tolist()
+    shingle_sets = [_shingle_hashes(text) for text in texts]
+    signatures = _signatures_from_shingles(shingle_sets)
+
+    # Union-find over the distinct transcripts
+    parent = np.arange(len(unique_positions))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    rows_per_band = NUM_PERMUTATIONS // LSH_BANDS
+    for band in range(LSH_BANDS):
+        band_slice = signatures[:, band * rows_per_band : (band + 1) * rows_per_band]
+        buckets: Dict[bytes, int] = {}
+        for node, key in enumerate(map(np.ndarray.tobytes, band_slice)):
+            anchor = buckets.setdefault(key, node)
+            if anchor == node:
+                continue
+            root_anchor, root_node = find(anchor), find(node)
+            if root_anchor == root_node:
+                continue
+            similarity = _jaccard(shingle_sets[anchor], shingle_sets[node])
+            if similarity >= threshold:
+                # Keep the earliest row as the root so it becomes the representative
+                low, high = sorted((root_anchor, root_node))
+                parent[high] = low
+
+    roots = np.array(
+        [find(node) for node in range(len(unique_positions))], dtype=np.intp
+    )
+    group_representatives = unique_positions[roots]
+
+    # Map each row -> its exact representative -> that representative's group root
+    lookup = pd.Series(group_representatives, index=unique_positions)
+    return lookup.loc[exact].to_numpy()
+
+
+def duplicate_groups(representatives: np.ndarray) -> Dict[int, np.ndarray]:
+    """
+    Invert a representative mapping into {representative position: member positions}
+
+    Args:
+        representatives (np.ndarray): Output of one of the *_representatives functions
+
+    Returns:
+        Dict[int, np.ndarray]: Member row positions for every representative
+    """
+    return {
+        int(representative): members
+        for representative, members in pd.Series(representatives)
+        .groupby(representatives)
+        .indices.items()
+    }
@@ -0,0 +1,171 @@
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+from typing import Dict, List, Optional
+
+# Rough BPE ratios: English/romanized text averages ~4 characters per token,
+# Indic scripts tokenize much worse at roughly 1.5 characters per token.
+ASCII_CHARS_PER_TOKEN = 4.0
+NON_ASCII_CHARS_PER_TOKEN = 1.5
+
+# Chat-format overhead per request (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 12
+
+# Expected answer size per flag: quoted key, colon, short answer, comma
+OUTPUT_TOKENS_PER_FLAG = 12
+
+# Rows whose request uses more than this share of the context window are outliers
+CONTEXT_OUTLIER_RATIO = 0.9
+
+
+def approximate_token_counts(texts: pd.Series) -> np.ndarray:
+    """
+    Approximate token counts without a model tokenizer
+
+    Only character and UTF-8 byte lengths are measured, so a million transcripts
+    are counted in a couple of seconds. Multi-byte (mostly 3-byte Indic) characters
+    are weighted more heavily than ASCII.
+
+    Args:
+        texts (pd.Series): Texts to count
+
+    Returns:
+        np.ndarray: Estimated token count per text
+    """
+    values = texts.fillna("").astype(str)
+    chars = values.str.len().to_numpy(dtype=np.float64)
+    utf8_bytes = np.fromiter(
+        (len(text.encode("utf-8")) for text in values),
+        dtype=np.float64,
+        count=len(values),
+    )
+    non_ascii = np.minimum((utf8_bytes - chars) / 2.0, chars)
+    ascii_chars = chars - non_ascii
+    tokens = ascii_chars / ASCII_CHARS_PER_TOKEN + non_ascii / NON_ASCII_CHARS_PER_TOKEN
+    return np.ceil(tokens).astype(np.int64)
+
+
+def approximate_prompt_tokens(prompt: str) -> int:
+    """
+    Approximate the token count of a single rendered prompt
+
+    Args:
+        prompt (str): Rendered prompt text
+
+    Returns:
+        int: Estimated token count
+    """
+    return int(approximate_token_counts(pd.Series([prompt]))[0])
+
+
+def estimate_output_tokens(config: Dict[str, str]) -> int:
+    """
+    Estimate the size of the JSON answer for a config
+
+    Args:
+        config (Dict[str, str]): Configuration dictionary with flag names as keys
+
+    Returns:
+        int: Estimated completion tokens per transcript
+    """
+    key_tokens = approximate_token_counts(pd.Series(list(config.keys()))).sum()
+    return int(key_tokens) + OUTPUT_TOKENS_PER_FLAG * len(config) + 2
+
+
+def estimate_run(
+    transcript_tokens: np.ndarray,
+    system_prompts: List[str],
+    configs: List[Dict[str, str]],
+    limits: Dict[str, float],
+    concurrency: int,
+    observed_latencies: Optional[List[float]] = None,
+) -> Dict[str, float]:
+    """
+    Predict tokens, cost and wall-clock time of a run before it starts
+
+    Wall-clock time is the slowest of three bounds: concurrency x latency,
+    the provider's request-per-minute limit and its token-per-minute limit.
+
+    Args:
+        transcript_tokens (np.ndarray): Token counts of the transcripts that will be sent
+        system_prompts (List[str]): Rendered system prompt of every flag group
+        configs (List[Dict[str, str]]): Config of every flag group (one entry if not split)
+        limits (Dict[str, float]): Provider entry from call_analysis.PROVIDER_LIMITS
+        concurrency (int): Number of concurrent requests
+        observed_latencies (Optional[List[float]]): Seconds per request from earlier runs
+
+    Returns:
+        Dict[str, float]: Token, cost and time estimates
+    """
+    transcripts = len(transcript_tokens)
+    requests = transcripts * len(configs)
+    prompt_tokens = sum(
+        approximate_prompt_tokens(prompt) + MESSAGE_OVERHEAD_TOKENS
+        for prompt in system_prompts
+    )
+    input_tokens = (
+        float(np.sum(transcript_tokens)) * len(configs) + prompt_tokens * transcripts
+    )
+    output_tokens = float(
+        sum(estimate_output_tokens(config) for config in configs) * transcripts
+    )
+
+    if observed_latencies:
+        latency = float(np.median(observed_latencies))
+    else:
+        latency = limits["expected_latency"]
+
+    concurrency_seconds = np.ceil(requests / max(concurrency, 1)) * latency
+    rate_limit_seconds = requests / limits["requests_per_minute"] * 60.0
+    token_limit_seconds = (input_tokens + output_tokens) / limits["tokens_per_minute"] * 60.0
+
+    cost = (
+        input_tokens / 1000.0 * limits["input_cost_per_1k"]
+        + output_tokens / 1000.0 * limits["output_cost_per_1k"]
+    )
+
+    return {
+        "requests": requests,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost": cost,
+        "latency": latency,
+        "latency_observed": bool(observed_latencies),
+        "seconds": max(concurrency_seconds, rate_limit_seconds, token_limit_seconds),
+        "concurrency_seconds": concurrency_seconds,
+        "rate_limit_seconds": rate_limit_seconds,
+        "token_limit_seconds": token_limit_seconds,
+    }
+
+
+def context_outliers(
+    transcript_tokens: pd.Series,
+    system_prompts: List[str],
+    configs: List[Dict[str, str]],
+    context_window: int,
+) -> pd.DataFrame:
+    """
+    Find rows whose request may not fit in the model's context window
+
+    Args:
+        transcript_tokens (pd.Series): Transcript token counts indexed like the uploaded CSV
+        system_prompts (List[str]): Rendered system prompt of every flag group
+        configs (List[Dict[str, str]]): Config of every flag group (one entry if not split)
+        context_window (int): Model context size in tokens
+
+    Returns:
+        pd.DataFrame: Outlier rows with estimated tokens and share of the context window,
+            largest first
+    """
+    # The largest group request decides whether a transcript fits
+    fixed_tokens = max(
+        approximate_prompt_tokens(prompt)
+        + MESSAGE_OVERHEAD_TOKENS
+        + estimate_output_tokens(config)
+        for prompt, config in zip(system_prompts, configs)
+    )
+    total = transcript_tokens + fixed_tokens
+    share = total / context_window
+    outliers = pd.DataFrame({"Estimated Tokens": total, "Context Used": share})
+    return outliers[share > CONTEXT_OUTLIER_RATIO].sort_values(
+        "Estimated Tokens", ascending=False
+    )
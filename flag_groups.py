@@ -0,0 +1,103 @@
+import math
+from typing import Dict, List, Optional
+
+# Grouping modes offered on the Config page
+GROUPING_SINGLE = "Single prompt"
+GROUPING_AUTO = "Automatic"
+GROUPING_MANUAL = "Manual"
+GROUPING_MODES = [GROUPING_SINGLE, GROUPING_AUTO, GROUPING_MANUAL]
+
+# Default budget of answer tokens per group in automatic mode (~5 flags)
+DEFAULT_GROUP_OUTPUT_TOKENS = 80
+
+
+def auto_flag_groups(
+    config: Dict[str, str], max_output_tokens: int = DEFAULT_GROUP_OUTPUT_TOKENS
+) -> List[Dict[str, str]]:
+    """
+    Split a config into groups whose estimated JSON answer fits a token budget
+
+    The number of groups is the smallest that fits the budget on average, and
+    flags are spread over them in config order so the groups are of similar size.
+
+    Args:
+        config (Dict[str, str]): Configuration dictionary with flag names as keys
+        max_output_tokens (int): Estimated answer tokens allowed per group
+
+    Returns:
+        List[Dict[str, str]]: Sub-configs, one per group
+    """
+    # Deferred: estimator pulls in pandas, which manual grouping does not need
+    from estimator import estimate_output_tokens
+
+    if not config:
+        return []
+
+    sizes = {
+        flag: estimate_output_tokens({flag: description})
+        for flag, description in config.items()
+    }
+    total = sum(sizes.values())
+    group_count = min(len(config), max(1, math.ceil(total / max_output_tokens)))
+    target = total / group_count
+
+    groups: List[Dict[str, str]] = [{} for _ in range(group_count)]
+    cumulative = 0
+    for flag, description in config.items():
+        # Place each flag by the midpoint of its share of the total answer size
+        index = min(group_count - 1, int((cumulative + sizes[flag] / 2) // target))
+        groups[index][flag] = description
+        cumulative += sizes[flag]
+
+    return [group for group in groups if group]
+
+
+def manual_flag_groups(
+    config: Dict[str, str], labels: Dict[str, str]
+) -> List[Dict[str, str]]:
+    """
+    Split a config by the group label the user gave each flag
+
+    Flags without a label share one group. Groups are ordered by first appearance.
+
+    Args:
+        config (Dict[str, str]): Configuration dictionary with flag names as keys
+        labels (Dict[str, str]): Group label per flag name
+
+    Returns:
+        List[Dict[str, str]]: Sub-configs, one per group
+    """
+    groups: Dict[str, Dict[str, str]] = {}
+    for flag, description in config.items():
+        label = (labels.get(flag) or "").strip()
+        groups.setdefault(label, {})[flag] = description
+    return list(groups.values())
+
+
+def build_flag_groups(
+    config: Dict[str, str],
+    mode: str,
+    labels: Optional[Dict[str, str]] = None,
+    max_output_tokens: int = DEFAULT_GROUP_OUTPUT_TOKENS,
+) -> Optional[List[Dict[str, str]]]:
+    """
+    Build the flag groups for a grouping mode
+
+    Args:
+        config (Dict[str, str]): Configuration dictionary with flag names as keys
+        mode (str): One of GROUPING_MODES
+        labels (Optional[Dict[str, str]]): Group label per flag (manual mode)
+        max_output_tokens (int): Estimated answer tokens per group (automatic mode)
+
+    Returns:
+        Optional[List[Dict[str, str]]]: Sub-configs, or None if the config should be
+            sent as a single prompt
+    """
+    if mode == GROUPING_AUTO:
+        groups = auto_flag_groups(config, max_output_tokens)
+    elif mode == GROUPING_MANUAL:
+        groups = manual_flag_groups(config, labels or {})
+    else:
+        return None
+
+    return groups if len(groups) > 1 else None
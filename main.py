@@ -1,5 +1,6 @@
 import streamlit as st
 from auth import show_auth_page
+from settings import MODELS
 
 # Configure the Streamlit page
 st.set_page_config(
@@ -13,14 +14,14 @@ st.set_page_config(
 if "password_correct" not in st.session_state:
     st.session_state["password_correct"] = False
 if "selected_model" not in st.session_state:
-    st.session_state.selected_model = "llama"
+    st.session_state.selected_model = MODELS[0]
 
 # Sidebar for model selection
 with st.sidebar:
     st.title("Model Selection")
     st.selectbox(
         "Choose a model for analysis:",
-        options=["llama", "gpt4o", "sarvam-m"],
+        options=MODELS,
         key="selected_model",
     )
 
@@ -1,5 +1,12 @@
 import streamlit as st
-import pandas as pd  # type: ignore
+import sys
+import os
+
+# Streamlit re-executes this script on every rerun; only add the root once
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+from settings import MODELS
 
 # Configure the page
 st.set_page_config(
@@ -21,6 +28,9 @@ def show_home_page():
     uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
 
     if uploaded_file is not None:
+        # Deferred so the page renders without loading pandas until a file arrives
+        import pandas as pd  # type: ignore
+
         try:
             # Read the CSV file
             df = pd.read_csv(uploaded_file, low_memory=False, dtype=str)
@@ -84,7 +94,7 @@ with st.sidebar:
     st.title("Model Selection")
     st.selectbox(
         "Choose a model for analysis:",
-        options=["llama", "gpt4o", "sarvam-m"],
+        options=MODELS,
         key="selected_model",
     )
 
@@ -1,6 +1,20 @@
 import streamlit as st
-import pandas as pd  # type: ignore
-import json
+import sys
+import os
+
+# Streamlit re-executes this script on every rerun; only add the root once
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+from flag_groups import (
+    GROUPING_MODES,
+    GROUPING_SINGLE,
+    GROUPING_AUTO,
+    GROUPING_MANUAL,
+    DEFAULT_GROUP_OUTPUT_TOKENS,
+    build_flag_groups,
+)
+from settings import MODELS
 
 # Configure the page
 st.set_page_config(
@@ -29,6 +43,12 @@ def initialize_config():
     """Initialize configuration in session state if not present"""
     if "config_data" not in st.session_state:
         st.session_state.config_data = DEFAULT_CONFIG.copy()
+    if "flag_group_labels" not in st.session_state:
+        st.session_state.flag_group_labels = {}
+    if "flag_grouping" not in st.session_state:
+        st.session_state.flag_grouping = GROUPING_SINGLE
+    if "group_output_tokens" not in st.session_state:
+        st.session_state.group_output_tokens = DEFAULT_GROUP_OUTPUT_TOKENS
 
 
 def show_config_page():
@@ -37,12 +57,18 @@ def show_config_page():
         "Manage your analysis configuration below. You can delete or add new flags as needed."
     )
 
+    # Deferred so redirects and the sidebar do not load pandas
+    import pandas as pd  # type: ignore
+
     initialize_config()
 
     # Convert config to DataFrame for editing
     config_df = pd.DataFrame(
         list(st.session_state.config_data.items()), columns=["Key", "Value"]
     )
+    config_df["Group"] = (
+        config_df["Key"].map(st.session_state.flag_group_labels).fillna("").astype(str)
+    )
 
     # Display editable dataframe
     edited_df = st.data_editor(
@@ -59,10 +85,47 @@ def show_config_page():
                 max_chars=500,
                 required=True,
             ),
+            "Group": st.column_config.TextColumn(
+                "Group",
+                help="Flags with the same group are sent in one prompt (Manual grouping)",
+                max_chars=50,
+            ),
         },
         key="config_editor",
     )
 
+    # Flag grouping: split the config into smaller prompts sent concurrently
+    st.subheader("Flag Grouping")
+    grouping = st.radio(
+        "How should flags be sent to the model?",
+        options=GROUPING_MODES,
+        index=GROUPING_MODES.index(st.session_state.flag_grouping),
+        horizontal=True,
+        help="Smaller prompts answer faster and a malformed answer only loses its own group.",
+    )
+    group_output_tokens = st.number_input(
+        "Estimated answer tokens per group",
+        min_value=20,
+        value=int(st.session_state.group_output_tokens),
+        step=10,
+        disabled=grouping != GROUPING_AUTO,
+    )
+    if grouping == GROUPING_MANUAL:
+        st.caption("Flags with an empty Group share one prompt.")
+
+    preview_df = edited_df.dropna(subset=["Key", "Value"])
+    groups = build_flag_groups(
+        dict(zip(preview_df["Key"], preview_df["Value"])),
+        grouping,
+        dict(zip(preview_df["Key"], preview_df["Group"].fillna(""))),
+        group_output_tokens,
+    )
+    if groups:
+        for number, group in enumerate(groups, start=1):
+            st.write(f"**Prompt {number}**: {', '.join(group.keys())}")
+    else:
+        st.caption("All flags are sent in a single prompt.")
+
     # Save configuration and proceed to analysis
     if st.button("🔄 Process Calls", use_container_width=True):
         # Validate configuration
@@ -78,6 +141,11 @@ def show_config_page():
             st.session_state.config_data = dict(
                 zip(edited_df["Key"], edited_df["Value"])
             )
+            st.session_state.flag_group_labels = dict(
+                zip(edited_df["Key"], edited_df["Group"].fillna(""))
+            )
+            st.session_state.flag_grouping = grouping
+            st.session_state.group_output_tokens = group_output_tokens
             st.success("Configuration saved successfully!")
             # Redirect to analysis page
             st.switch_page("pages/3_Analysis.py")
@@ -101,7 +169,7 @@ with st.sidebar:
     st.title("Model Selection")
     st.selectbox(
         "Choose a model for analysis:",
-        options=["llama", "gpt4o", "sarvam-m"],
+        options=MODELS,
         key="selected_model",
     )
 
@@ -1,17 +1,53 @@
 import streamlit as st
 import pandas as pd  # type: ignore
+import numpy as np  # type: ignore
 import asyncio
 import json
 from typing import Dict, List
 import sys
 import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Streamlit re-executes this script on every rerun; only add the root once
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
 from call_analysis import (
-    analyze_transcript_with_config_llama,
-    analyze_transcript_with_config_gpt4o,
-    analyze_transcript_with_config_sarvam,
+    analyze_transcript_batch,
+    generate_system_prompt,
+    Hedger,
+    LatencyTracker,
+    PROVIDER_LIMITS,
+    SKIPPED_VALUE,
 )
+from dedup import (
+    exact_duplicate_representatives,
+    near_duplicate_representatives,
+    duplicate_groups,
+)
+from estimator import approximate_token_counts, estimate_run, context_outliers
+from settings import MODELS
+from flag_groups import (
+    GROUPING_SINGLE,
+    DEFAULT_GROUP_OUTPUT_TOKENS,
+    build_flag_groups,
+)
+from pilot import (
+    FailureMonitor,
+    OUTCOMES,
+    classify_result,
+    stratified_sample,
+    summarize_pilot,
+)
+
+# Maximum number of provider requests in flight at the same time; with flag
+# groups each transcript sends one request per group
+CONCURRENT_TASKS = 50
+
+# Number of recent request latencies kept per model for the estimator
+LATENCY_HISTORY_SIZE = 1000
+
+# Default cap on hedged requests, as a share of the requests in a run
+DEFAULT_HEDGE_SHARE = 0.05
 
 # Configure the page
 st.set_page_config(
@@ -35,53 +71,103 @@ if not hasattr(st.session_state, "uploaded_df") or not hasattr(
     st.stop()
 
 
-async def analyze_transcript_batch(
-    transcripts: List[str],
-    config: Dict[str, str],
+@st.cache_data(show_spinner="Finding duplicate transcripts...")
+def find_representatives(
+    transcripts: pd.Series, collapse: bool, near_duplicates: bool, threshold: float
+) -> np.ndarray:
+    """
+    Map every row to the row whose analysis result it will reuse
+    """
+    if not collapse:
+        return np.arange(len(transcripts))
+    if near_duplicates:
+        return near_duplicate_representatives(transcripts, threshold)
+    return exact_duplicate_representatives(transcripts)
+
+
+@st.cache_data(show_spinner="Estimating tokens...")
+def count_transcript_tokens(transcripts: pd.Series) -> pd.Series:
+    """
+    Approximate token count of every transcript, indexed like the uploaded CSV
+    """
+    return pd.Series(approximate_token_counts(transcripts), index=transcripts.index)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration in seconds as a short human readable string
+    """
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def show_preflight_estimate(
+    df: pd.DataFrame,
+    representative_positions: List[int],
+    configs: List[Dict[str, str]],
     model: str,
-    semaphore: asyncio.Semaphore,
-    progress_callback=None,
 ):
     """
-    Process transcripts in batches with semaphore control
+    Show predicted tokens, cost and duration of the run before it starts
     """
-    results = []
-
-    async def process_single_transcript(idx: int, transcript: str):
-        async with semaphore:
-            try:
-                if model == "llama":
-                    result = await analyze_transcript_with_config_llama(
-                        transcript, config
-                    )
-                elif model == "gpt4o":
-                    result = await analyze_transcript_with_config_gpt4o(
-                        transcript, config
-                    )
-                else:
-                    result = await analyze_transcript_with_config_sarvam(
-                        transcript, config
-                    )
-                if progress_callback:
-                    progress_callback(idx, result)
-                return idx, result
-            except Exception as e:
-                st.error(f"Error processing transcript {idx}: {e}")
-                error_result = {key: "error" for key in config.keys()}
-                if progress_callback:
-                    progress_callback(idx, error_result)
-                return idx, error_result
+    limits = PROVIDER_LIMITS.get(model)
+    if limits is None:
+        return
+
+    system_prompts = [generate_system_prompt(config) for config in configs]
+    transcript_tokens = count_transcript_tokens(df["Transcript"])
+    observed = st.session_state.get("observed_latencies", {}).get(model)
+
+    estimate = estimate_run(
+        transcript_tokens.iloc[representative_positions].to_numpy(),
+        system_prompts,
+        configs,
+        limits,
+        CONCURRENT_TASKS,
+        observed,
+    )
+
+    st.subheader("Pre-flight Estimate")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Input Tokens (approx.)", f"{estimate['input_tokens']:,.0f}")
 
-    # Create tasks for all transcripts
-    tasks = [
-        process_single_transcript(idx, transcript)
-        for idx, transcript in enumerate(transcripts)
-    ]
+    with col2:
+        st.metric("Output Tokens (approx.)", f"{estimate['output_tokens']:,.0f}")
 
-    # Process all tasks
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    with col3:
+        st.metric("Estimated Cost", f"${estimate['cost']:,.2f}")
+
+    with col4:
+        st.metric("Estimated Duration", format_duration(estimate["seconds"]))
+
+    latency_source = "observed median" if estimate["latency_observed"] else "configured"
+    st.caption(
+        f"{estimate['requests']:,} requests at {estimate['latency']:.1f}s per request "
+        f"({latency_source}). Concurrency bound: "
+        f"{format_duration(estimate['concurrency_seconds'])}, request limit bound: "
+        f"{format_duration(estimate['rate_limit_seconds'])}, token limit bound: "
+        f"{format_duration(estimate['token_limit_seconds'])}."
+    )
 
-    return results
+    outliers = context_outliers(
+        transcript_tokens, system_prompts, configs, limits["context_window"]
+    )
+    if not outliers.empty:
+        st.warning(
+            f"⚠️ {len(outliers)} transcript(s) may exceed the "
+            f"{limits['context_window']:,}-token context window of `{model}`."
+        )
+        with st.expander("📏 Oversized Transcripts"):
+            outliers.insert(0, "Interaction ID", df.loc[outliers.index, "Interaction ID"])
+            st.dataframe(
+                outliers.style.format({"Context Used": "{:.0%}"}),
+                use_container_width=True,
+            )
 
 
 def show_analysis_page():
@@ -92,9 +178,114 @@ def show_analysis_page():
     df = st.session_state.uploaded_df
     config = st.session_state.config_data
 
+    # Deduplication settings
+    with st.expander("🧹 Duplicate Transcripts"):
+        collapse = st.toggle(
+            "Analyze identical transcripts only once",
+            value=True,
+            help="Whitespace-only differences are ignored; the result is copied to every duplicate.",
+        )
+        near_duplicates = st.toggle(
+            "Also collapse near-duplicates",
+            value=False,
+            disabled=not collapse,
+            help="Uses MinHash over word shingles; similar transcripts reuse one result.",
+        )
+        threshold = st.slider(
+            "Near-duplicate similarity threshold",
+            min_value=0.5,
+            max_value=1.0,
+            value=0.9,
+            step=0.01,
+            disabled=not (collapse and near_duplicates),
+        )
+
+    representatives = find_representatives(
+        df["Transcript"], collapse, near_duplicates, threshold
+    )
+    groups = duplicate_groups(representatives)
+    representative_positions = list(groups.keys())
+
+    # Latency settings
+    with st.expander("⚡ Latency"):
+        stream = st.toggle(
+            "Stream responses",
+            value=False,
+            help="Read the answer as it is generated and stop as soon as the JSON "
+            "object is complete, skipping any trailing explanation.",
+        )
+        hedging = st.toggle(
+            "Hedge slow requests",
+            value=False,
+            help="If a request is slower than the model's observed p95, send a duplicate "
+            "and keep whichever valid answer arrives first.",
+        )
+        fallback_model = st.selectbox(
+            "Send duplicates to:",
+            options=["Same model"]
+            + [m for m in MODELS if m != st.session_state.selected_model],
+            disabled=not hedging,
+        )
+        max_hedges = st.number_input(
+            "Maximum duplicate requests",
+            min_value=0,
+            value=max(1, int(len(groups) * DEFAULT_HEDGE_SHARE)),
+            step=1,
+            disabled=not hedging,
+        )
+        deadline = PROVIDER_LIMITS[st.session_state.selected_model]["request_deadline"]
+        st.caption(f"Every request is abandoned after {deadline:.0f}s.")
+
+    # Pilot run and early stopping settings
+    with st.expander("🧪 Pilot & Safety"):
+        pilot_size = st.number_input(
+            "Pilot sample size",
+            min_value=1,
+            value=max(1, min(50, len(groups))),
+            step=1,
+            help="Unique transcripts sampled in proportion to their Number of Messages.",
+        )
+        auto_stop = st.toggle(
+            "Stop the run on systemic failure",
+            value=True,
+            help="Skip the remaining transcripts once too many recent calls came back "
+            "as API errors or unparseable answers.",
+        )
+        stop_threshold = st.slider(
+            "Failure rate that stops the run",
+            min_value=0.1,
+            max_value=1.0,
+            value=0.5,
+            step=0.05,
+            disabled=not auto_stop,
+        )
+        stop_window = st.number_input(
+            "Recent transcripts considered",
+            min_value=1,
+            value=50,
+            step=1,
+            disabled=not auto_stop,
+        )
+        stop_min_samples = st.number_input(
+            "Transcripts before the run can stop",
+            min_value=1,
+            max_value=int(stop_window),
+            value=min(20, int(stop_window)),
+            step=1,
+            disabled=not auto_stop,
+        )
+
+    # Split the config into concurrently sent flag groups if configured
+    flag_groups = build_flag_groups(
+        config,
+        st.session_state.get("flag_grouping", GROUPING_SINGLE),
+        st.session_state.get("flag_group_labels", {}),
+        st.session_state.get("group_output_tokens", DEFAULT_GROUP_OUTPUT_TOKENS),
+    )
+
     # Display basic info
     st.subheader("Analysis Overview")
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
         st.metric("Total Transcripts", len(df))
@@ -103,11 +294,125 @@ def show_analysis_page():
         st.metric("Analysis Parameters", len(config))
 
     with col3:
-        st.metric("Concurrent Tasks", 50)
+        st.metric("Concurrent Requests", CONCURRENT_TASKS)
+
+    with col4:
+        st.metric("Unique Transcripts", len(groups))
+
+    with col5:
+        saved = len(df) - len(groups)
+        st.metric(
+            "API Calls Saved",
+            saved,
+            delta=f"{saved / len(df):.1%}" if len(df) else None,
+        )
 
     # Add model display to overview
     st.subheader(f"Selected Model: `{st.session_state.selected_model}`")
 
+    if flag_groups:
+        st.caption(
+            f"Flags are split into {len(flag_groups)} prompts per transcript: "
+            + "; ".join(", ".join(group.keys()) for group in flag_groups)
+        )
+
+    show_preflight_estimate(
+        df,
+        representative_positions,
+        flag_groups or [config],
+        st.session_state.selected_model,
+    )
+
+    def build_hedger():
+        """Hedging state; the latency tracker carries observed p95s across runs"""
+        if not hedging:
+            return None
+        if "latency_tracker" not in st.session_state:
+            st.session_state.latency_tracker = LatencyTracker()
+        return Hedger(
+            st.session_state.latency_tracker,
+            int(max_hedges),
+            None if fallback_model == "Same model" else fallback_model,
+        )
+
+    def remember_latencies(model: str, latencies: List[float]):
+        """Remember request latencies so the next estimate uses observed values"""
+        if "observed_latencies" not in st.session_state:
+            st.session_state.observed_latencies = {}
+        history = st.session_state.observed_latencies.get(model, []) + latencies
+        st.session_state.observed_latencies[model] = history[-LATENCY_HISTORY_SIZE:]
+
+    # Pilot run on a stratified sample; results are shown but not kept
+    if st.button("🧪 Run Pilot", use_container_width=True):
+        sample = stratified_sample(
+            df["Number of Messages"].iloc[representative_positions], int(pilot_size)
+        )
+        pilot_positions = [representative_positions[i] for i in sample]
+        model = st.session_state.selected_model
+        latencies: List[float] = []
+
+        try:
+            with st.spinner(f"Running pilot on {len(pilot_positions)} transcripts..."):
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                pilot_results = loop.run_until_complete(
+                    analyze_transcript_batch(
+                        df["Transcript"].iloc[pilot_positions].tolist(),
+                        config,
+                        model,
+                        asyncio.Semaphore(CONCURRENT_TASKS),
+                        None,
+                        latencies,
+                        build_hedger(),
+                        flag_groups,
+                        stream,
+                    )
+                )
+                loop.close()
+
+            remember_latencies(model, latencies)
+
+            # gather returns (idx, result) pairs, or the exception a task raised
+            pilot_answers = [
+                item[1] if isinstance(item, tuple) else {} for item in pilot_results
+            ]
+            outcomes = [classify_result(result, config) for result in pilot_answers]
+            summary = summarize_pilot(outcomes, latencies)
+
+            st.subheader("Pilot Results")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Sampled Transcripts", summary["transcripts"])
+            with col2:
+                st.metric("Parse Success Rate", f"{summary['parse_success_rate']:.0%}")
+            with col3:
+                st.metric("p50 Latency", f"{summary['latency_p50']:.1f}s")
+            with col4:
+                st.metric("p95 Latency", f"{summary['latency_p95']:.1f}s")
+
+            st.dataframe(
+                pd.DataFrame(
+                    {"Transcripts": [summary[outcome] for outcome in OUTCOMES]},
+                    index=pd.Index(OUTCOMES, name="Outcome"),
+                ),
+                use_container_width=True,
+            )
+
+            pilot_df = pd.DataFrame(pilot_answers, columns=list(config.keys()))
+            pilot_df.insert(0, "Outcome", outcomes)
+            pilot_df.insert(
+                0,
+                "Number of Messages",
+                df["Number of Messages"].iloc[pilot_positions].values,
+            )
+            pilot_df.insert(
+                0, "Interaction ID", df["Interaction ID"].iloc[pilot_positions].values
+            )
+            st.dataframe(pilot_df, use_container_width=True)
+
+        except Exception as e:
+            st.error(f"Error during pilot: {str(e)}")
+
     # Create results dataframe structure
     result_columns = ["Interaction ID"] + list(config.keys())
     results_df = pd.DataFrame(index=range(len(df)), columns=result_columns)
@@ -130,12 +435,15 @@ def show_analysis_page():
 
     def update_progress(idx: int, result: Dict[str, str]):
         nonlocal completed_count
-        completed_count += 1
+
+        # Fan the representative's result out to every duplicate row
+        members = groups[representative_positions[idx]]
+        completed_count += len(members)
 
         # Update the results dataframe
         for key, value in result.items():
             if key in results_df.columns:
-                results_df.loc[idx, key] = value
+                results_df.loc[members, key] = value
 
         # Update progress
         progress = completed_count / len(df)
@@ -151,12 +459,21 @@ def show_analysis_page():
     if st.button("🚀 Start Analysis", use_container_width=True):
         status_text.text("Starting analysis...")
 
-        # Create semaphore for limiting concurrent tasks
-        semaphore = asyncio.Semaphore(50)
+        # Create semaphore for limiting concurrent requests
+        semaphore = asyncio.Semaphore(CONCURRENT_TASKS)
 
-        # Get transcripts and model
-        transcripts = df["Transcript"].tolist()
+        # Get one transcript per duplicate group and the model
+        transcripts = df["Transcript"].iloc[representative_positions].tolist()
         model = st.session_state.selected_model
+        latencies: List[float] = []
+        stream_timings: List[Dict] = []
+
+        hedger = build_hedger()
+        monitor = (
+            FailureMonitor(config, stop_threshold, int(stop_window), int(stop_min_samples))
+            if auto_stop
+            else None
+        )
 
         try:
             # Run the async analysis
@@ -165,19 +482,70 @@ def show_analysis_page():
 
             results = loop.run_until_complete(
                 analyze_transcript_batch(
-                    transcripts, config, model, semaphore, update_progress
+                    transcripts,
+                    config,
+                    model,
+                    semaphore,
+                    update_progress,
+                    latencies,
+                    hedger,
+                    flag_groups,
+                    stream,
+                    stream_timings,
+                    monitor,
                 )
             )
 
             loop.close()
 
+            remember_latencies(model, latencies)
+
             # Final update
-            status_text.text("✅ Analysis completed!")
-            st.success("All transcripts have been analyzed successfully!")
+            if monitor is not None and monitor.tripped:
+                flags = list(config.keys())
+                skipped = results_df[flags].eq(SKIPPED_VALUE).any(axis=1)
+                skipped_rows = int(skipped.sum())
+                status_text.text("⛔ Analysis stopped!")
+                st.error(
+                    f"Stopped after the recent failure rate reached {monitor.tripped_failure_rate:.0%}; "
+                    f"{skipped_rows} transcripts were skipped. Check the provider URL, keys "
+                    f"and configuration, then run a pilot before starting again."
+                )
+            else:
+                status_text.text("✅ Analysis completed!")
+                st.success("All transcripts have been analyzed successfully!")
+            if stream and stream_timings:
+                timings = pd.DataFrame(stream_timings)
+                first_token = timings["time_to_first_token"].dropna()
+                complete_json = timings["time_to_json"].dropna()
+                medians = [
+                    f"to {label} {values.median():.1f}s"
+                    for label, values in (
+                        ("first token", first_token),
+                        ("complete JSON", complete_json),
+                    )
+                    if len(values)
+                ]
+                summary = f"Median time {', '.join(medians)}; " if medians else ""
+                st.info(
+                    f"📡 {summary}"
+                    f"{timings['stopped_early'].mean():.0%} of streams closed "
+                    f"before [DONE]."
+                )
+            if hedger is not None:
+                st.info(
+                    f"⚡ {hedger.hedges_fired} duplicate request(s) sent, "
+                    f"{hedger.hedges_won} answered first."
+                )
 
             # Store results in session state for potential export
             st.session_state.analysis_results = results_df
 
+            # Keep the latest run per model for the analytics page
+            if "analysis_runs" not in st.session_state:
+                st.session_state.analysis_runs = {}
+            st.session_state.analysis_runs[model] = results_df
+
             # Add export button
             if st.button("📥 Export Results", use_container_width=True):
                 csv_data = results_df.to_csv(index=False)
@@ -208,6 +576,11 @@ with st.sidebar:
     if st.button("⚙️ Back to Config"):
         st.switch_page("pages/2_Config.py")
 
+    # Show analytics button once a run has completed
+    if st.session_state.get("analysis_runs"):
+        if st.button("📈 Analytics"):
+            st.switch_page("pages/4_Analytics.py")
+
     if st.button("🚪 Logout"):
         st.session_state.password_correct = False
         st.switch_page("main.py")
@@ -215,7 +588,7 @@ with st.sidebar:
     st.title("Model Selection")
     st.selectbox(
         "Choose a model for analysis:",
-        options=["llama", "gpt4o", "sarvam-m"],
+        options=MODELS,
         key="selected_model",
     )
 
@@ -0,0 +1,160 @@
+import streamlit as st
+import pandas as pd  # type: ignore
+import sys
+import os
+
+# Streamlit re-executes this script on every rerun; only add the root once
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+from analytics import (
+    flag_violation_rates,
+    flag_cooccurrence,
+    violations_by_message_bucket,
+    failure_rates_by_provider,
+)
+
+# Configure the page
+st.set_page_config(
+    page_title="CSV Analyzer - Analytics",
+    page_icon="📈",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+
+# Check if user is authenticated
+if not st.session_state.get("password_correct", False):
+    st.switch_page("main.py")
+
+# Check if a completed run is available
+if not st.session_state.get("analysis_runs"):
+    st.error("No completed analysis found. Please run an analysis first.")
+    st.stop()
+
+
+# Reruns (e.g. toggling a widget) reuse results until the run or flags change
+@st.cache_data
+def cached_violation_rates(results_df: pd.DataFrame, flags: list) -> pd.DataFrame:
+    return flag_violation_rates(results_df, flags)
+
+
+@st.cache_data
+def cached_cooccurrence(
+    results_df: pd.DataFrame, flags: list, normalize: bool
+) -> pd.DataFrame:
+    return flag_cooccurrence(results_df, flags, normalize=normalize)
+
+
+@st.cache_data
+def cached_violations_by_bucket(
+    results_df: pd.DataFrame, number_of_messages: pd.Series, flags: list
+) -> pd.DataFrame:
+    return violations_by_message_bucket(results_df, number_of_messages, flags)
+
+
+@st.cache_data
+def cached_failure_rates_by_provider(
+    combined_df: pd.DataFrame, flags: list
+) -> pd.DataFrame:
+    return failure_rates_by_provider(combined_df, flags)
+
+
+def combine_runs(runs: dict) -> pd.DataFrame:
+    """
+    Stack the latest run of every model into one frame with a "Model" column
+    """
+    frames = [run.assign(Model=model) for model, run in runs.items()]
+    return pd.concat(frames, ignore_index=True)
+
+
+def show_analytics_page():
+    st.title("📈 Flag Analytics")
+
+    runs = st.session_state.analysis_runs
+    config = st.session_state.config_data
+    flags = list(config.keys())
+
+    model = st.selectbox("Results from model:", options=list(runs.keys()))
+    results_df = runs[model]
+
+    # Only keep flags that are present in this run (config may have changed since)
+    flags = [flag for flag in flags if flag in results_df.columns]
+    if not flags:
+        st.warning("The selected run has no flags from the current configuration.")
+        return
+
+    # Overview
+    st.subheader("Analysis Overview")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Analyzed Calls", len(results_df))
+    with col2:
+        st.metric("Flags", len(flags))
+
+    st.subheader("Violation Rate per Flag")
+    rates = cached_violation_rates(results_df, flags)
+    st.dataframe(
+        rates.style.format({"Violation Rate": "{:.1%}", "Failure Rate": "{:.1%}"}),
+        use_container_width=True,
+    )
+    st.bar_chart(rates["Violation Rate"])
+
+    st.subheader("Flag Co-occurrence")
+    normalize = st.toggle(
+        "Show as conditional rate (row flag = yes ⇒ column flag = yes)", value=False
+    )
+    cooccurrence = cached_cooccurrence(results_df, flags, normalize)
+    st.dataframe(
+        cooccurrence.style.format("{:.1%}" if normalize else "{:,.0f}"),
+        use_container_width=True,
+    )
+
+    st.subheader("Violations by Number of Messages")
+    uploaded_df = st.session_state.get("uploaded_df")
+    if uploaded_df is not None and len(uploaded_df) == len(results_df):
+        by_bucket = cached_violations_by_bucket(
+            results_df, uploaded_df["Number of Messages"], flags
+        )
+        st.dataframe(
+            by_bucket.style.format({flag: "{:.1%}" for flag in flags}),
+            use_container_width=True,
+        )
+        st.line_chart(by_bucket[flags])
+    else:
+        st.info("The uploaded CSV no longer matches this run; re-run to see buckets.")
+
+    st.subheader("Failure Rate per Provider")
+    provider_flags = [
+        flag
+        for flag in flags
+        if all(flag in run.columns for run in runs.values())
+    ]
+    if not provider_flags:
+        st.info("Runs from different models share no flags to compare.")
+        return
+    by_provider = cached_failure_rates_by_provider(combine_runs(runs), provider_flags)
+    st.dataframe(
+        by_provider.style.format(
+            {"Call Failure Rate": "{:.1%}", "Flag Failure Rate": "{:.1%}"}
+        ),
+        use_container_width=True,
+    )
+
+
+# Add navigation in sidebar
+with st.sidebar:
+    st.markdown("### Navigation")
+
+    if st.button("🏠 Back to Home"):
+        st.switch_page("pages/1_Home.py")
+
+    if st.button("🔍 Back to Analysis"):
+        st.switch_page("pages/3_Analysis.py")
+
+    if st.button("🚪 Logout"):
+        st.session_state.password_correct = False
+        st.switch_page("main.py")
+
+
+if __name__ == "__main__":
+    show_analytics_page()
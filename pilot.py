@@ -0,0 +1,134 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from analytics import message_buckets
+
+# Outcome of a single analyzed transcript
+OUTCOME_OK = "ok"
+OUTCOME_PARTIAL = "partial"
+OUTCOME_PARSE_FAILURE = "parse_failure"
+OUTCOME_API_FAILURE = "api_failure"
+OUTCOMES = [OUTCOME_OK, OUTCOME_PARTIAL, OUTCOME_PARSE_FAILURE, OUTCOME_API_FAILURE]
+
+
+def classify_result(result: Optional[Dict[str, str]], config: Dict[str, str]) -> str:
+    """
+    Bucket a single analysis result
+
+    Args:
+        result (Optional[Dict[str, str]]): Merged result for one transcript
+        config (Dict[str, str]): Configuration dictionary with flag names as keys
+
+    Returns:
+        str: ok, partial (some flags missing or failed), parse_failure (no parsed
+            answers) or api_failure (every flag "failed"/"error")
+    """
+    if not result:
+        return OUTCOME_PARSE_FAILURE
+    values = [result.get(flag) for flag in config.keys()]
+    failed = [value in ("failed", "error") for value in values]
+    if all(failed):
+        return OUTCOME_API_FAILURE
+    if any(failed) or any(value is None for value in values):
+        return OUTCOME_PARTIAL
+    return OUTCOME_OK
+
+
+def stratified_sample(
+    number_of_messages: pd.Series, sample_size: int, seed: int = 0
+) -> np.ndarray:
+    """
+    Pick rows in proportion to their "Number of Messages" bucket
+
+    Every non-empty bucket gets at least one row, so short and very long calls
+    are both represented even in a small pilot.
+
+    Args:
+        number_of_messages (pd.Series): Column of the candidate rows
+        sample_size (int): Approximate number of rows to pick
+        seed (int): Random seed
+
+    Returns:
+        np.ndarray: Positions (into number_of_messages) of the sampled rows
+    """
+    buckets = message_buckets(number_of_messages.reset_index(drop=True))
+    buckets = buckets.cat.add_categories(["Unknown"]).fillna("Unknown")
+
+    shares = buckets.value_counts(normalize=True)
+    quotas = np.maximum(1, np.round(shares * sample_size)).where(shares > 0, 0)
+
+    # Shuffle, then keep the first quota rows of every bucket
+    order = np.random.default_rng(seed).permutation(len(buckets))
+    shuffled = buckets.iloc[order]
+    rank = shuffled.groupby(shuffled, observed=True).cumcount()
+    keep = rank.to_numpy() < shuffled.map(quotas).astype(float).to_numpy()
+    return np.sort(order[keep])
+
+
+def summarize_pilot(outcomes: List[str], latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarize a pilot run
+
+    Args:
+        outcomes (List[str]): classify_result output per transcript
+        latencies (List[float]): Request latencies in seconds
+
+    Returns:
+        Dict[str, float]: Transcript count, parse success rate, count per outcome and
+            latency percentiles
+    """
+    counts = (
+        pd.Series(outcomes, dtype="object")
+        .value_counts()
+        .reindex(OUTCOMES, fill_value=0)
+    )
+    total = int(counts.sum())
+    parsed = counts[OUTCOME_OK] + counts[OUTCOME_PARTIAL]
+    p50, p95 = np.percentile(latencies, [50, 95]) if latencies else (np.nan, np.nan)
+    return {
+        "transcripts": total,
+        "parse_success_rate": parsed / total if total else np.nan,
+        **{outcome: int(counts[outcome]) for outcome in OUTCOMES},
+        "latency_p50": float(p50),
+        "latency_p95": float(p95),
+    }
+
+
+class FailureMonitor:
+    """
+    Watches the rolling failure rate of a run and trips once it crosses a threshold.
+
+    A transcript counts as failed if it is a parse or API failure. The monitor
+    only trips after min_samples transcripts (at most window) so a couple of
+    early errors do not stop a healthy run. tripped_failure_rate keeps the rate
+    at the moment it tripped; failure_rate keeps moving as in-flight results land.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, str],
+        threshold: float = 0.5,
+        window: int = 50,
+        min_samples: int = 20,
+    ):
+        self.config = config
+        self.threshold = threshold
+        # The window never holds more than window results
+        self.min_samples = min(min_samples, window)
+        self.recent: Deque[bool] = deque(maxlen=window)
+        self.tripped = False
+        self.failure_rate = 0.0
+        self.tripped_failure_rate: Optional[float] = None
+
+    def record(self, result: Optional[Dict[str, str]]):
+        outcome = classify_result(result, self.config)
+        self.recent.append(outcome in (OUTCOME_PARSE_FAILURE, OUTCOME_API_FAILURE))
+        self.failure_rate = sum(self.recent) / len(self.recent)
+        if self.tripped:
+            return
+        if len(self.recent) >= self.min_samples and self.failure_rate >= self.threshold:
+            self.tripped = True
+            self.tripped_failure_rate = self.failure_rate
@@ -0,0 +1,90 @@
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict
+
+from dotenv import load_dotenv
+
+# Models offered in the sidebar of every page
+MODELS = ["llama", "gpt4o", "sarvam-m"]
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment configuration, read once per process"""
+
+    username: str
+    password: str
+    openai_url: str
+    openai_api_key: str
+    sarvam_url: str
+    sarvam_api_key: str
+    llama_url: str
+    llama_api_key: str
+    # Provider limits and pricing used by the pre-flight estimator and request hedging.
+    # Costs are USD per 1k tokens; expected_latency (seconds) is used until a run
+    # has been observed. Sarvam includes the 30s pause after every response.
+    # request_timeout is the httpx timeout, request_deadline caps the whole call
+    # (including hedges and Sarvam's pause).
+    provider_limits: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+def _provider_limits() -> Dict[str, Dict[str, float]]:
+    return {
+        "llama": {
+            "context_window": int(os.getenv("LLAMA_CONTEXT_WINDOW", "128000")),
+            "requests_per_minute": float(os.getenv("LLAMA_RPM", "600")),
+            "tokens_per_minute": float(os.getenv("LLAMA_TPM", "1000000")),
+            "input_cost_per_1k": float(os.getenv("LLAMA_INPUT_COST_PER_1K", "0.00072")),
+            "output_cost_per_1k": float(os.getenv("LLAMA_OUTPUT_COST_PER_1K", "0.00072")),
+            "expected_latency": float(os.getenv("LLAMA_EXPECTED_LATENCY", "8")),
+            "request_timeout": float(os.getenv("LLAMA_REQUEST_TIMEOUT", "30")),
+            "request_deadline": float(os.getenv("LLAMA_REQUEST_DEADLINE", "60")),
+        },
+        "gpt4o": {
+            "context_window": int(os.getenv("OPENAI_CONTEXT_WINDOW", "128000")),
+            "requests_per_minute": float(os.getenv("OPENAI_RPM", "2700")),
+            "tokens_per_minute": float(os.getenv("OPENAI_TPM", "450000")),
+            "input_cost_per_1k": float(os.getenv("OPENAI_INPUT_COST_PER_1K", "0.0025")),
+            "output_cost_per_1k": float(os.getenv("OPENAI_OUTPUT_COST_PER_1K", "0.01")),
+            "expected_latency": float(os.getenv("OPENAI_EXPECTED_LATENCY", "5")),
+            "request_timeout": float(os.getenv("OPENAI_REQUEST_TIMEOUT", "60")),
+            "request_deadline": float(os.getenv("OPENAI_REQUEST_DEADLINE", "90")),
+        },
+        "sarvam-m": {
+            "context_window": int(os.getenv("SARVAM_CONTEXT_WINDOW", "32000")),
+            "requests_per_minute": float(os.getenv("SARVAM_RPM", "60")),
+            "tokens_per_minute": float(os.getenv("SARVAM_TPM", "200000")),
+            "input_cost_per_1k": float(os.getenv("SARVAM_INPUT_COST_PER_1K", "0")),
+            "output_cost_per_1k": float(os.getenv("SARVAM_OUTPUT_COST_PER_1K", "0")),
+            "expected_latency": float(os.getenv("SARVAM_EXPECTED_LATENCY", "36")),
+            "request_timeout": float(os.getenv("SARVAM_REQUEST_TIMEOUT", "30")),
+            "request_deadline": float(os.getenv("SARVAM_REQUEST_DEADLINE", "90")),
+        },
+    }
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Load the .env file and environment once and return the shared settings.
+
+    Streamlit re-executes page scripts on every interaction, but imported modules
+    stay in sys.modules, so this cache lives for the whole server process.
+
+    Returns:
+        Settings: The process-wide settings object
+    """
+    load_dotenv()  # Load environment variables from .env file
+
+    return Settings(
+        username=os.getenv("USERNAME", "admin"),
+        password=os.getenv("PASSWORD", "admin123"),
+        openai_url=os.getenv("OPENAI_API_URL", "none"),
+        openai_api_key=os.getenv("AZURE_OPENAI_API_KEY", "none"),
+        sarvam_url=os.getenv("SARVAM_API_URL", "none"),
+        sarvam_api_key=os.getenv("SARVAM_SUBSCRIPTION_KEY", "none"),
+        llama_url=os.getenv("LLAMA_URL", "none"),
+        llama_api_key=os.getenv("LLAMA_API_KEY", "none"),
+        provider_limits=_provider_limits(),
+    )
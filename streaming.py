@@ -0,0 +1,120 @@
+import json
+from typing import Any, Dict, Iterable, Optional
+
+
+class IncrementalJSONObjectParser:
+    """
+    Finds the first top-level JSON object in text that arrives in pieces.
+
+    Text before the opening brace (markdown fences, "Sure, here is...") is
+    skipped. Braces inside strings are ignored, so the object is known to be
+    complete as soon as its closing brace arrives, without waiting for the rest
+    of the completion.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.complete = False
+
+    def feed(self, text: str) -> bool:
+        """
+        Consume the next piece of the completion
+
+        Args:
+            text (str): Newly received text
+
+        Returns:
+            bool: True once the first top-level object is complete
+        """
+        if self.complete:
+            return True
+
+        # Index in this piece where the object text begins
+        start = 0 if self.started else None
+        for position, char in enumerate(text):
+            if not self.started:
+                if char != "{":
+                    continue
+                self.started = True
+                start = position
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.buffer.append(text[start : position + 1])
+                    self.complete = True
+                    return True
+
+        if self.started:
+            self.buffer.append(text[start:])
+        return False
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """
+        Parse the completed object
+
+        Returns:
+            Optional[Dict[str, Any]]: The object, or None if it is incomplete or invalid JSON
+        """
+        if not self.complete:
+            return None
+        try:
+            parsed = json.loads("".join(self.buffer))
+        except json.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+
+    def has_keys(self, keys: Iterable[str]) -> bool:
+        """
+        Check that the completed object contains every expected key
+
+        Args:
+            keys (Iterable[str]): Expected keys, e.g. the config's flag names
+
+        Returns:
+            bool: True if the object is complete, valid and has all keys
+        """
+        parsed = self.result()
+        return parsed is not None and all(key in parsed for key in keys)
+
+
+def parse_sse_line(line: str) -> Optional[str]:
+    """
+    Extract the content delta from one server-sent event line of a chat completion stream
+
+    Args:
+        line (str): A line of the event stream
+
+    Returns:
+        Optional[str]: The content delta ("" for events without content), or None at
+            the end of the stream ("data: [DONE]")
+    """
+    if not line.startswith("data:"):
+        return ""
+    payload = line[len("data:") :].strip()
+    if payload == "[DONE]":
+        return None
+    try:
+        event = json.loads(payload)
+    except json.JSONDecodeError:
+        return ""
+    # Azure sends an initial event with an empty choices list (content filter results)
+    choices = event.get("choices") or []
+    if not choices:
+        return ""
+    return (choices[0].get("delta") or {}).get("content") or ""
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from analytics import (
+    failure_rates_by_provider,
+    flag_cooccurrence,
+    flag_violation_rates,
+    normalize_flag_values,
+    violations_by_message_bucket,
+)
+
+FLAGS = ["Loop", "Date"]
+
+
+def results():
+    return pd.DataFrame(
+        {
+            "Loop": ["Yes", " no", "failed", "yes", "yes"],
+            "Date": ["no", "YES", "no", "no", "skipped"],
+            "Model": ["llama", "llama", "llama", "gpt4o", "gpt4o"],
+        }
+    )
+
+
+def test_normalize_flag_values():
+    values = normalize_flag_values(results(), FLAGS)
+    assert values["Loop"].tolist() == ["yes", "no", "failed", "yes", "yes"]
+    assert list(values.columns) == FLAGS
+
+
+def test_violation_rates_use_answered_calls():
+    rates = flag_violation_rates(results(), FLAGS)
+    # The skipped transcript (last row) is left out entirely
+    assert rates.loc["Loop", "Violations"] == 2
+    assert rates.loc["Loop", "Answered"] == 3
+    assert rates.loc["Loop", "Failure Rate"] == 0.25
+    assert rates.loc["Date", "Violation Rate"] == 0.25
+
+
+def test_bucket_rates_match_flag_rates_for_a_single_bucket():
+    messages = pd.Series(["3"] * 5)
+    by_bucket = violations_by_message_bucket(results(), messages, FLAGS)
+    rates = flag_violation_rates(results(), FLAGS)
+    assert by_bucket.loc["1-5", "Calls"] == 4
+    for flag in FLAGS:
+        assert by_bucket.loc["1-5", flag] == rates.loc[flag, "Violation Rate"]
+
+
+def test_cooccurrence():
+    matrix = flag_cooccurrence(results(), FLAGS)
+    assert matrix.loc["Loop", "Loop"] == 2
+    assert matrix.loc["Loop", "Date"] == 0
+    normalized = flag_cooccurrence(results(), FLAGS, normalize=True)
+    assert normalized.loc["Loop", "Loop"] == 1.0
+
+
+def test_failure_rates_by_provider_ignore_skipped_transcripts():
+    frame = results()
+    frame.loc[1, ["Loop", "Date"]] = "failed"
+    summary = failure_rates_by_provider(frame, FLAGS)
+    assert summary.loc["llama", "Calls"] == 3
+    assert summary.loc["llama", "Failed Calls"] == 1
+    assert summary.loc["gpt4o", "Calls"] == 1
+    assert summary.loc["gpt4o", "Call Failure Rate"] == 0.0
+
+
+def test_empty_results():
+    empty = results().iloc[:0]
+    assert flag_violation_rates(empty, FLAGS)["Answered"].tolist() == [0, 0]
+    assert flag_cooccurrence(empty, FLAGS).to_numpy().sum() == 0
+    by_bucket = violations_by_message_bucket(empty, pd.Series([], dtype=object), FLAGS)
+    assert by_bucket["Calls"].sum() == 0 and np.isnan(by_bucket[FLAGS]).all().all()
+    assert len(failure_rates_by_provider(empty, FLAGS)) == 0
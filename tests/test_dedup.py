@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from dedup import (
+    duplicate_groups,
+    exact_duplicate_representatives,
+    near_duplicate_representatives,
+    normalize_transcripts,
+)
+
+
+def random_transcripts(count, words=60, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(2000)]
+    return [" ".join(rng.choice(vocabulary) for _ in range(words)) for _ in range(count)]
+
+
+def test_normalize_collapses_whitespace_only():
+    normalized = normalize_transcripts(pd.Series(["  John\tSmith,\n 15/Jan ", None]))
+    assert normalized.tolist() == ["John Smith, 15/Jan", ""]
+
+
+def test_exact_duplicates_ignore_whitespace():
+    transcripts = pd.Series(["a  b", "c", "a b", "C"])
+    assert exact_duplicate_representatives(transcripts).tolist() == [0, 1, 0, 3]
+
+
+def test_case_and_punctuation_differences_are_not_merged():
+    transcripts = pd.Series(
+        [
+            "agent: confirm your name John Smith, date 15/Jan/2024 thanks",
+            "agent: confirm your name JOHN SMITH. date 15 jan 2024 thanks",
+        ]
+    )
+    assert near_duplicate_representatives(transcripts, 1.0).tolist() == [0, 1]
+    assert near_duplicate_representatives(transcripts, 0.9).tolist() == [0, 1]
+
+
+def test_near_duplicates_are_merged():
+    original = random_transcripts(1)[0]
+    words = original.split()
+    words[30] = "changed"
+    transcripts = pd.Series([original, " ".join(words), original])
+    assert near_duplicate_representatives(transcripts, 0.85).tolist() == [0, 0, 0]
+
+
+def test_unrelated_transcripts_are_not_merged():
+    transcripts = pd.Series(random_transcripts(2000))
+    representatives = near_duplicate_representatives(transcripts, 0.5)
+    assert (representatives == np.arange(len(transcripts))).all()
+
+
+def test_empty_input():
+    empty = pd.Series([], dtype=object)
+    assert len(exact_duplicate_representatives(empty)) == 0
+    assert len(near_duplicate_representatives(empty, 0.9)) == 0
+    assert duplicate_groups(near_duplicate_representatives(empty, 0.9)) == {}
+
+
+def test_duplicate_groups():
+    groups = duplicate_groups(np.array([0, 1, 0, 3, 1]))
+    assert {key: members.tolist() for key, members in groups.items()} == {
+        0: [0, 2],
+        1: [1, 4],
+        3: [3],
+    }
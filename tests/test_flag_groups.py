@@ -0,0 +1,50 @@
+from flag_groups import (
+    GROUPING_AUTO,
+    GROUPING_MANUAL,
+    GROUPING_SINGLE,
+    auto_flag_groups,
+    build_flag_groups,
+    manual_flag_groups,
+)
+
+CONFIG = {f"Flag{i}": f"Description of flag {i}" for i in range(12)}
+
+
+def flags_in_order(groups):
+    return [flag for group in groups for flag in group]
+
+
+def test_auto_groups_cover_every_flag_in_order():
+    groups = auto_flag_groups(CONFIG, max_output_tokens=30)
+    assert len(groups) > 1
+    assert flags_in_order(groups) == list(CONFIG)
+    assert all(group[flag] == CONFIG[flag] for group in groups for flag in group)
+
+
+def test_auto_groups_are_balanced():
+    sizes = [len(group) for group in auto_flag_groups(CONFIG, max_output_tokens=30)]
+    assert max(sizes) - min(sizes) <= 1
+
+
+def test_auto_groups_edge_cases():
+    assert auto_flag_groups({}) == []
+    assert auto_flag_groups(CONFIG, max_output_tokens=10_000) == [CONFIG]
+    # A budget below a single flag's answer gives one flag per group
+    assert len(auto_flag_groups(CONFIG, max_output_tokens=1)) == len(CONFIG)
+
+
+def test_manual_groups_by_label():
+    labels = {"Flag0": "a", "Flag1": " b ", "Flag2": "a", "Flag3": ""}
+    groups = manual_flag_groups(dict(list(CONFIG.items())[:5]), labels)
+    assert [list(group) for group in groups] == [
+        ["Flag0", "Flag2"],
+        ["Flag1"],
+        ["Flag3", "Flag4"],
+    ]
+
+
+def test_build_flag_groups_returns_none_for_a_single_group():
+    assert build_flag_groups(CONFIG, GROUPING_SINGLE) is None
+    assert build_flag_groups(CONFIG, GROUPING_MANUAL, {}) is None
+    assert build_flag_groups(CONFIG, GROUPING_AUTO, max_output_tokens=10_000) is None
+    assert len(build_flag_groups(CONFIG, GROUPING_AUTO, max_output_tokens=30)) > 1
@@ -0,0 +1,82 @@
+import pandas as pd
+
+from analytics import message_buckets
+from pilot import (
+    OUTCOME_API_FAILURE,
+    OUTCOME_OK,
+    OUTCOME_PARSE_FAILURE,
+    OUTCOME_PARTIAL,
+    FailureMonitor,
+    classify_result,
+    stratified_sample,
+    summarize_pilot,
+)
+
+CONFIG = {"Loop": "", "Date": ""}
+
+
+def test_classify_result():
+    assert classify_result({"Loop": "yes", "Date": "no"}, CONFIG) == OUTCOME_OK
+    assert classify_result({"Loop": "yes"}, CONFIG) == OUTCOME_PARTIAL
+    assert classify_result({"Loop": "yes", "Date": "error"}, CONFIG) == OUTCOME_PARTIAL
+    assert classify_result({"Loop": "failed", "Date": "error"}, CONFIG) == OUTCOME_API_FAILURE
+    assert classify_result({}, CONFIG) == OUTCOME_PARSE_FAILURE
+    assert classify_result(None, CONFIG) == OUTCOME_PARSE_FAILURE
+
+
+def test_stratified_sample_covers_every_bucket():
+    # 95 short calls and 5 long ones; a plain random sample of 10 often misses the latter
+    messages = pd.Series(["3"] * 95 + ["80"] * 5 + ["n/a"])
+    sample = stratified_sample(messages, 10)
+    assert len(set(sample)) == len(sample)
+    assert sample.min() >= 0 and sample.max() < len(messages)
+    sampled = messages.iloc[sample]
+    assert (sampled == "80").any() and (sampled == "n/a").any()
+    assert 8 <= len(sample) <= 13
+    assert len(stratified_sample(pd.Series([], dtype=object), 10)) == 0
+
+
+def test_stratified_sample_is_reproducible_and_bucket_proportional():
+    messages = pd.Series([str(n) for n in range(1, 101)] * 3)
+    first = stratified_sample(messages, 30, seed=1)
+    assert first.tolist() == stratified_sample(messages, 30, seed=1).tolist()
+    shares = message_buckets(messages.iloc[first]).value_counts(normalize=True)
+    expected = message_buckets(messages).value_counts(normalize=True)
+    assert (shares - expected).abs().max() < 0.1
+
+
+def test_summarize_pilot():
+    summary = summarize_pilot(
+        [OUTCOME_OK, OUTCOME_OK, OUTCOME_PARTIAL, OUTCOME_API_FAILURE], [1.0, 2.0, 3.0]
+    )
+    assert summary["transcripts"] == 4
+    assert summary["parse_success_rate"] == 0.75
+    assert summary[OUTCOME_API_FAILURE] == 1
+    assert summary["latency_p50"] == 2.0
+
+
+def test_monitor_waits_for_min_samples():
+    monitor = FailureMonitor(CONFIG, threshold=0.5, window=50, min_samples=20)
+    for _ in range(19):
+        monitor.record({"Loop": "failed", "Date": "failed"})
+    assert not monitor.tripped
+    monitor.record(None)
+    assert monitor.tripped
+
+
+def test_monitor_trips_when_min_samples_exceeds_window():
+    monitor = FailureMonitor(CONFIG, threshold=0.5, window=5, min_samples=20)
+    for _ in range(5):
+        monitor.record({"Loop": "failed", "Date": "failed"})
+    assert monitor.tripped
+
+
+def test_monitor_keeps_the_rate_it_tripped_at():
+    monitor = FailureMonitor(CONFIG, threshold=0.5, window=4, min_samples=4)
+    for _ in range(4):
+        monitor.record({})
+    for _ in range(4):
+        monitor.record({"Loop": "no", "Date": "no"})
+    assert monitor.tripped
+    assert monitor.tripped_failure_rate == 1.0
+    assert monitor.failure_rate == 0.0
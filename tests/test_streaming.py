@@ -0,0 +1,51 @@
+import json
+
+from streaming import IncrementalJSONObjectParser, parse_sse_line
+
+
+def feed_all(parser, pieces):
+    return [parser.feed(piece) for piece in pieces]
+
+
+def test_parser_skips_prefix_and_stops_at_closing_brace():
+    parser = IncrementalJSONObjectParser()
+    done = feed_all(parser, ["Sure! ```json\n{\"Lo", "op\": \"yes\"", "} trailing {"])
+    assert done == [False, False, True]
+    assert parser.result() == {"Loop": "yes"}
+
+
+def test_parser_ignores_braces_and_escaped_quotes_in_strings():
+    parser = IncrementalJSONObjectParser()
+    text = '{"Name": "a } \\" { b", "Nested": {"x": 1}}'
+    assert feed_all(parser, list(text))[-1] is True
+    assert parser.result() == json.loads(text)
+
+
+def test_parser_incomplete_or_invalid_object():
+    parser = IncrementalJSONObjectParser()
+    parser.feed('{"Loop": "yes"')
+    assert parser.result() is None
+    assert not parser.has_keys(["Loop"])
+
+    invalid = IncrementalJSONObjectParser()
+    assert invalid.feed("{Loop: yes}")
+    assert invalid.result() is None
+
+
+def test_parser_has_keys():
+    parser = IncrementalJSONObjectParser()
+    parser.feed('{"Loop": "yes", "Date": "no"}')
+    assert parser.has_keys(["Loop", "Date"])
+    assert not parser.has_keys(["Loop", "PIN"])
+
+
+def test_parse_sse_line():
+    event = {"choices": [{"index": 0, "delta": {"content": "{\"Lo"}}]}
+    assert parse_sse_line("data: " + json.dumps(event)) == "{\"Lo"
+    assert parse_sse_line("data: [DONE]") is None
+    assert parse_sse_line("") == ""
+    assert parse_sse_line(": keep-alive") == ""
+    assert parse_sse_line("data: not json") == ""
+    # Azure content filter event and the final event without content
+    assert parse_sse_line('data: {"choices": []}') == ""
+    assert parse_sse_line('data: {"choices": [{"delta": {}, "finish_reason": "stop"}]}') == ""